@@ -0,0 +1,30 @@
+"""
+Shared Config Loader
+Parses config/settings.yaml once per process and memoizes the result,
+so constructing multiple agents doesn't repeat file I/O + YAML parsing.
+"""
+
+from functools import lru_cache
+
+import yaml
+
+# Prefer the libyaml-backed C loader (5-15x faster than the pure-Python
+# SafeLoader); fall back gracefully when PyYAML was built without libyaml.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+@lru_cache(maxsize=8)
+def load_config(config_path: str) -> dict:
+    """
+    Load and parse a YAML config file, cached per path.
+
+    All agents read the same settings.yaml, so the parsed dict is shared;
+    callers must treat it as read-only.
+    """
+    # Read bytes in one syscall and let the loader decode UTF-8 once,
+    # instead of streaming through Python's incremental text decoder.
+    with open(config_path, 'rb') as f:
+        return yaml.load(f.read(), Loader=_YamlLoader)
@@ -5,11 +5,11 @@ resizes them to vertical (9:16) format for social media.
 """
 
 from pathlib import Path
-import yaml
+from agents._config import load_config
 
 from models import Highlight, Clip
-from skills.clip_extraction import extract_clip
-from skills.video_resize import resize_to_vertical
+from skills.clip_extraction import extract_clips_batch
+from utils.ffmpeg_utils import snap_to_keyframes
 
 
 class EditorAgent:
@@ -18,9 +18,11 @@ class EditorAgent:
     from the original podcast based on detected highlights.
     """
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_path: str = "config/settings.yaml", *, config=None):
+        # Accept a preparsed config dict (shared by the orchestrator, as
+        # a keyword) or fall back to loading the YAML file from
+        # config_path — which stays first so Agent("path.yaml") works.
+        self.config = config if config is not None else load_config(config_path)
 
     def process(
         self,
@@ -31,6 +33,11 @@ class EditorAgent:
         """
         Extract clips from video at highlight timestamps and resize to vertical.
 
+        All clips are extracted in a single batched ffmpeg invocation: the
+        source container is opened and demuxed once, and each output group
+        encodes only its own highlight window (with the vertical crop/scale
+        fused in unless skip_resize is set).
+
         Args:
             video_path: Path to source video
             highlights: List of detected highlights
@@ -43,43 +50,51 @@ class EditorAgent:
         output_dir = Path(self.config['paths']['output_dir'])
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        clips = []
-        for highlight in highlights:
-            # Add padding
-            padded_start = max(0, highlight.start - reel_config['padding_before'])
-            padded_end = highlight.end + reel_config['padding_after']
+        if not highlights:
+            return []
 
-            # Cut clip
-            clip_filename = f"clip_{highlight.id:03d}.mp4"
-            clip_path = str(output_dir / clip_filename)
+        suffix = "" if skip_resize else "_vertical"
 
-            extract_clip(
-                video_path=video_path,
-                output_path=clip_path,
-                start=padded_start,
-                end=padded_end,
-            )
+        # When no resize (hence no filter) is needed and exact cuts aren't
+        # required, snap cut points to keyframes so ffmpeg can stream-copy
+        # the clips instead of decoding + re-encoding them.
+        stream_copy = skip_resize and not reel_config.get('exact_cuts', True)
 
-            if skip_resize:
-                final_path = clip_path
-            else:
-                # Resize to vertical
-                vertical_filename = f"clip_{highlight.id:03d}_vertical.mp4"
-                vertical_path = str(output_dir / vertical_filename)
+        # Hoist loop invariants: dict lookups and Path construction stay
+        # outside the per-highlight loop.
+        out_base = str(output_dir)
+        padding_before = reel_config['padding_before']
+        padding_after = reel_config['padding_after']
 
-                resize_to_vertical(
-                    video_path=clip_path,
-                    output_path=vertical_path,
+        # Pre-compute every (start, end, output) tuple, then extract all
+        # clips in one ffmpeg pass.
+        jobs = []
+        for highlight in highlights:
+            padded_start = max(0, highlight.start - padding_before)
+            padded_end = highlight.end + padding_after
+            if stream_copy:
+                padded_start, padded_end = snap_to_keyframes(
+                    video_path, padded_start, padded_end
                 )
-                final_path = vertical_path
+            clip_path = f"{out_base}/clip_{highlight.id:03d}{suffix}.mp4"
+            jobs.append((padded_start, padded_end, clip_path))
+
+        extract_clips_batch(
+            video_path=video_path,
+            jobs=jobs,
+            vertical=not skip_resize,
+            hardware=self.config.get('video', {}).get('hardware', 'cpu'),
+            stream_copy=stream_copy,
+        )
 
-            clips.append(Clip(
+        return [
+            Clip(
                 id=highlight.id,
                 source_path=video_path,
-                clip_path=final_path,
+                clip_path=clip_path,
                 start=padded_start,
                 end=padded_end,
                 highlight=highlight,
-            ))
-
-        return clips
+            )
+            for highlight, (padded_start, padded_end, clip_path) in zip(highlights, jobs)
+        ]
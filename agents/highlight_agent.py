@@ -11,7 +11,9 @@ Scoring signals:
 - Audience appeal (likely to generate shares/comments)
 """
 
-import yaml
+import numpy as np
+
+from agents._config import load_config
 
 from typing import Optional
 from models import Transcript, Highlight
@@ -24,9 +26,11 @@ class HighlightAgent:
     the best moments to turn into reels.
     """
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_path: str = "config/settings.yaml", *, config=None):
+        # Accept a preparsed config dict (shared by the orchestrator, as
+        # a keyword) or fall back to loading the YAML file from
+        # config_path — which stays first so Agent("path.yaml") works.
+        self.config = config if config is not None else load_config(config_path)
 
     def detect(
         self,
@@ -58,34 +62,41 @@ class HighlightAgent:
             signals=detection_config['signals'],
         )
 
+        # Build segment arrays once; the per-highlight overlap aggregation
+        # below is vectorized over them instead of looping in Python.
+        seg_starts = np.array([s.start for s in transcript.segments])
+        seg_ends = np.array([s.end for s in transcript.segments])
+        speaker_index = {}
+        speaker_codes = np.array([
+            speaker_index.setdefault(s.speaker, len(speaker_index))
+            for s in transcript.segments
+        ], dtype=np.intp)
+        speakers = list(speaker_index)
+
         # Post-process: Ensure speaker consistency
         cleaned_highlights = []
         for h in highlights:
-            # check segments in this range
-            segments = transcript.get_segments_in_range(h.start, h.end)
-            if not segments:
-                continue
-            
-            # Identify dominant speaker (by duration)
-            speaker_durations = {}
-            for seg in segments:
-                dur = min(seg.end, h.end) - max(seg.start, h.start)
-                if dur > 0:
-                    speaker_durations[seg.speaker] = speaker_durations.get(seg.speaker, 0) + dur
-            
-            if not speaker_durations:
+            # Identify dominant speaker (by overlap duration with the highlight)
+            overlap = np.minimum(seg_ends, h.end) - np.maximum(seg_starts, h.start)
+            np.maximum(overlap, 0, out=overlap)
+            if not speakers or overlap.max(initial=0) <= 0:
                 continue
 
-            dominant_speaker = max(speaker_durations, key=speaker_durations.get)
+            speaker_durations = np.bincount(
+                speaker_codes, weights=overlap, minlength=len(speakers)
+            )
+            dominant_code = int(speaker_durations.argmax())
+            dominant_speaker = speakers[dominant_code]
             total_duration = h.end - h.start
-            dominant_ratio = speaker_durations[dominant_speaker] / total_duration
-            
+            dominant_ratio = speaker_durations[dominant_code] / total_duration
+
             # If dominant speaker is < 90% of the clip, try to trim
             if dominant_ratio < 0.9:
                 # Find the contiguous block of the dominant speaker
                 # This is a simple heuristic: Find the start/end of the dominant speaker's segments
                 # that fall within the highlight range
-                
+
+                segments = transcript.get_segments_in_range(h.start, h.end)
                 dom_segments = [s for s in segments if s.speaker == dominant_speaker]
                 if not dom_segments:
                     continue
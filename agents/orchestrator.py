@@ -13,14 +13,16 @@ Supports input from:
 - YouTube URL (downloaded via yt-dlp)
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 import time
 
 from rich.console import Console
-from rich.progress import Progress
 
 from models import PipelineResult, Reel, Platform
+from agents._config import load_config
 from agents.transcription_agent import TranscriptionAgent
 from agents.highlight_agent import HighlightAgent
 from agents.editor_agent import EditorAgent
@@ -43,12 +45,41 @@ class OrchestratorAgent:
         )
     """
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
+    def __init__(self, config_path: str = "config/settings.yaml", verbose: bool = True):
         self.config_path = config_path
-        self.transcription_agent = TranscriptionAgent(config_path)
-        self.highlight_agent = HighlightAgent(config_path)
-        self.editor_agent = EditorAgent(config_path)
-        self.subtitle_agent = SubtitleAgent(config_path)
+        self.verbose = verbose
+        # Parse the config once and hand the same dict to every child agent.
+        config = load_config(config_path)
+        self.transcription_agent = TranscriptionAgent(config=config)
+        self.highlight_agent = HighlightAgent(config=config)
+        self.editor_agent = EditorAgent(config=config)
+        self.subtitle_agent = SubtitleAgent(config=config)
+        # Shared worker pool, created lazily and reused across pipeline
+        # stages so worker spawn + import cost is paid once per run.
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._pool
+
+    def close(self):
+        """Shut down the shared worker pool (no-op if never used)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _log(self, message: str):
+        """Print progress via Rich unless running quietly (verbose=False)."""
+        if self.verbose:
+            console.print(message)
 
     def run(
         self,
@@ -77,45 +108,46 @@ class OrchestratorAgent:
             target_platforms = ["instagram", "tiktok", "youtube_shorts"]
 
         # Step 1: Load video
-        console.print("[bold blue]📥 Step 1/5: Loading video...[/]")
+        self._log("[bold blue]📥 Step 1/5: Loading video...[/]")
         video_path = load_video(input_path=input_path, input_url=input_url)
-        console.print(f"  ✅ Video loaded: {video_path}")
+        self._log(f"  ✅ Video loaded: {video_path}")
 
         # Step 2: Transcribe
-        console.print("[bold blue]🎤 Step 2/5: Transcribing Hebrew audio...[/]")
+        self._log("[bold blue]🎤 Step 2/5: Transcribing Hebrew audio...[/]")
         transcript = self.transcription_agent.transcribe(
             video_path=video_path,
             speed_up=speed_up_audio,
         )
-        console.print(f"  ✅ Transcribed {len(transcript.segments)} segments ({transcript.total_duration:.0f}s)")
+        self._log(f"  ✅ Transcribed {len(transcript.segments)} segments ({transcript.total_duration:.0f}s)")
 
         # Step 3: Detect highlights
-        console.print("[bold blue]🔍 Step 3/5: Detecting best moments...[/]")
+        self._log("[bold blue]🔍 Step 3/5: Detecting best moments...[/]")
         highlights = self.highlight_agent.detect(
             transcript=transcript,
             max_highlights=max_reels,
         )
-        console.print(f"  ✅ Found {len(highlights)} highlights")
+        self._log(f"  ✅ Found {len(highlights)} highlights")
 
         # Step 4: Cut clips & resize
-        console.print("[bold blue]✂️ Step 4/5: Cutting clips...[/]")
+        self._log("[bold blue]✂️ Step 4/5: Cutting clips...[/]")
         clips = self.editor_agent.process(
             video_path=video_path,
             highlights=highlights,
         )
-        console.print(f"  ✅ Cut {len(clips)} clips")
+        self._log(f"  ✅ Cut {len(clips)} clips")
 
         # Step 5: Add subtitles & export
-        console.print("[bold blue]📝 Step 5/5: Adding Hebrew subtitles...[/]")
+        self._log("[bold blue]📝 Step 5/5: Adding Hebrew subtitles...[/]")
         reels = self.subtitle_agent.process(
             clips=clips,
             transcript=transcript,
             platforms=[Platform(p) for p in target_platforms],
+            executor=self.pool,
         )
-        console.print(f"  ✅ Generated {len(reels)} reels")
+        self._log(f"  ✅ Generated {len(reels)} reels")
 
         elapsed = time.time() - start_time
-        console.print(f"\n[bold green]🎬 Done! {len(reels)} reels created in {elapsed:.1f}s[/]")
+        self._log(f"\n[bold green]🎬 Done! {len(reels)} reels created in {elapsed:.1f}s[/]")
 
         result = PipelineResult(
             input_source=input_path or input_url,
@@ -126,7 +158,7 @@ class OrchestratorAgent:
         )
 
         for reel in reels:
-            console.print(
+            self._log(
                 f"  📱 {reel.path} | {reel.duration:.0f}s | "
                 f"Score: {reel.virality_score}/10 | {reel.platform.value}"
             )
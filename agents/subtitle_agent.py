@@ -4,30 +4,60 @@ Generates styled Hebrew subtitles (RTL) for each clip and
 burns them into the video frames.
 """
 
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
-import yaml
+from agents._config import load_config
 
 from models import Clip, Reel, Transcript, Platform
 from skills.subtitle_generation import generate_subtitles
 from skills.subtitle_burn import burn_subtitles_into_video
 
 
+def _burn_one(clip_path: str, subtitle_path: str, master_path: str, hardware: str) -> str:
+    """Burn subtitles for one clip into its master reel. Runs in a pool worker.
+
+    Takes plain path strings so each job pickles a few bytes instead of a
+    full Clip model (with its embedded Highlight text).
+    """
+    return burn_subtitles_into_video(
+        video_path=clip_path,
+        subtitle_path=subtitle_path,
+        output_path=master_path,
+        hardware=hardware,
+    )
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, falling back to a copy (e.g. across filesystems)."""
+    Path(dst).unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 class SubtitleAgent:
     """
     Agent responsible for generating Hebrew subtitles and
     burning them into the final reel clips.
     """
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_path: str = "config/settings.yaml", *, config=None):
+        # Accept a preparsed config dict (shared by the orchestrator, as
+        # a keyword) or fall back to loading the YAML file from
+        # config_path — which stays first so Agent("path.yaml") works.
+        self.config = config if config is not None else load_config(config_path)
 
     def process(
         self,
         clips: list[Clip],
         transcript: Transcript,
         platforms: Optional[list] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
     ) -> list[Reel]:
         """
         Add Hebrew subtitles to clips and export as final reels.
@@ -38,10 +68,17 @@ class SubtitleAgent:
         3. Burn subtitles into the video
         4. Export platform-specific versions
 
+        Subtitle generation is cheap and stays serial. The burned output is
+        identical for every platform (only the filename differs), so each
+        clip is burned exactly once — in parallel across a process pool —
+        and the per-platform reels are hardlinked from that master file.
+
         Args:
             clips: List of extracted video clips
             transcript: Full transcript for subtitle text
             platforms: Target platforms (default: all)
+            executor: Optional shared process pool (the orchestrator passes
+                its own so workers are reused across stages)
 
         Returns:
             List of final Reel objects ready for upload
@@ -52,30 +89,67 @@ class SubtitleAgent:
         sub_config = self.config['subtitles']
         output_dir = Path(self.config['paths']['output_dir'])
 
-        reels = []
+        # Content-addressed cache: re-runs with unchanged transcript + style
+        # reuse the previously generated .ass files untouched.
+        cache_dir = output_dir / ".cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        out_base = str(output_dir)
+
+        # Generate subtitle files serially, collecting burn jobs as we go.
+        jobs = []
+        masters = []
         for clip in clips:
             # Get transcript segments for this clip's time range
             segments = transcript.get_segments_in_range(clip.start, clip.end)
 
-            # Generate subtitle file
-            subtitle_path = str(output_dir / f"clip_{clip.id:03d}.ass")
-            generate_subtitles(
-                segments=segments,
-                output_path=subtitle_path,
-                clip_start=clip.start,
-                style_config=sub_config,
-            )
+            # Generate subtitle file (one per clip, shared by all platforms)
+            subtitle_path = f"{out_base}/clip_{clip.id:03d}.ass"
 
-            # Burn subtitles into video for each platform
-            for platform in platforms:
-                reel_filename = f"reel_{clip.id:03d}_{platform.value}.mp4"
-                reel_path = str(output_dir / reel_filename)
+            cache_key = hashlib.blake2b(
+                repr((segments, clip.start, sub_config)).encode()
+            ).hexdigest()
+            cached_subtitle = cache_dir / f"{cache_key}.ass"
 
-                burn_subtitles_into_video(
-                    video_path=clip.clip_path,
-                    subtitle_path=subtitle_path,
-                    output_path=reel_path,
+            if not cached_subtitle.exists():
+                generate_subtitles(
+                    segments=segments,
+                    output_path=str(cached_subtitle),
+                    clip_start=clip.start,
+                    style_config=sub_config,
                 )
+            _link_or_copy(str(cached_subtitle), subtitle_path)
+
+            master_path = f"{out_base}/reel_{clip.id:03d}_master.mp4"
+            jobs.append((clip.clip_path, subtitle_path, master_path))
+            masters.append((clip, master_path))
+
+        hardware = self.config.get('video', {}).get('hardware', 'cpu')
+
+        if not jobs:
+            return []
+
+        if executor is not None:
+            futures = [executor.submit(_burn_one, *job, hardware) for job in jobs]
+            for future in futures:
+                future.result()
+        else:
+            # Each job just shells out to ffmpeg, so threads are enough —
+            # no interpreter fork, no re-imports. Leave headroom for
+            # ffmpeg's internal threading.
+            max_workers = max(1, min(len(jobs), (os.cpu_count() or 2) // 2))
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_burn_one, *job, hardware) for job in jobs]
+                for future in futures:
+                    future.result()
+
+        # One encode per clip; per-platform files are just hardlinks.
+        reels = []
+        for clip, master_path in masters:
+            for platform in platforms:
+                reel_path = f"{out_base}/reel_{clip.id:03d}_{platform.value}.mp4"
+                _link_or_copy(master_path, reel_path)
 
                 reels.append(Reel(
                     id=clip.id,
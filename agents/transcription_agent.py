@@ -8,12 +8,17 @@ Key optimizations:
 - Timestamps are adjusted back to original video time
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import yaml
+from agents._config import load_config
 
 from models import Transcript, TranscriptSegment
-from skills.audio_extraction import extract_audio_from_video
-from skills.transcription import transcribe_hebrew
+from skills.audio_extraction import (
+    extract_audio_from_video,
+    extract_audio_array_from_video,
+)
+from skills.transcription import transcribe_hebrew, transcribe_with_gemini_async
 
 
 class TranscriptionAgent:
@@ -22,9 +27,11 @@ class TranscriptionAgent:
     a timestamped Hebrew transcript.
     """
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, config_path: str = "config/settings.yaml", *, config=None):
+        # Accept a preparsed config dict (shared by the orchestrator, as
+        # a keyword) or fall back to loading the YAML file from
+        # config_path — which stays first so Agent("path.yaml") works.
+        self.config = config if config is not None else load_config(config_path)
 
     def transcribe(
         self,
@@ -48,29 +55,119 @@ class TranscriptionAgent:
             Transcript with timestamped Hebrew segments
         """
         speed_factor = self.config['audio']['speed_factor'] if speed_up else 1.0
+        method = self.config['whisper'].get('method', 'local')
 
-        # Step 1: Extract audio only (no video data)
-        audio_path = extract_audio_from_video(
+        # Step 1: Extract audio only (no video data).
+        # Gemini's File API needs a real file on disk; since that file gets
+        # uploaded over the network, compress it to 12 kbps opus (~40x
+        # smaller than .wav, speech stays fully intelligible). Local Whisper
+        # accepts a raw waveform, so pipe PCM straight from ffmpeg and skip
+        # the hundreds-of-MB .wav round-trip through the filesystem.
+        if method == "gemini":
+            audio_path = extract_audio_from_video(
+                video_path=video_path,
+                speed_factor=speed_factor,
+                sample_rate=self.config['audio']['sample_rate'],
+                channels=self.config['audio']['channels'],
+                codec="opus",
+            )
+        else:
+            audio_path = extract_audio_array_from_video(
+                video_path=video_path,
+                speed_factor=speed_factor,
+                sample_rate=self.config['audio']['sample_rate'],
+                channels=self.config['audio']['channels'],
+            )
+
+        from utils.ffmpeg_utils import get_video_duration
+
+        # Probe the original video's duration in a background thread: the
+        # ffprobe call is independent of transcription, so it overlaps the
+        # long model/API call instead of running after it.
+        with ThreadPoolExecutor(max_workers=1) as probe_pool:
+            duration_future = probe_pool.submit(get_video_duration, video_path)
+
+            # Step 2: Transcribe with Hebrew-optimized Whisper or Gemini
+            raw_segments = transcribe_hebrew(
+                audio_path=audio_path,
+                model_name=self.config['whisper']['model'],
+                device=self.config['whisper']['device'],
+                language=self.config['whisper']['language'],
+                method=method,
+                sample_rate=self.config['audio']['sample_rate'],
+            )
+
+            total_duration = duration_future.result()
+
+        # Step 3: Adjust timestamps back to original video time
+        # If audio was sped up 2x, multiply timestamps by 2 to get original times.
+        # model_construct skips Pydantic validation — the fields come straight
+        # from our own transcription backends, and for thousands of segments
+        # the validator dispatch is pure overhead.
+        segments = []
+        for i, seg in enumerate(raw_segments):
+            segments.append(TranscriptSegment.model_construct(
+                id=i,
+                start=seg['start'] * speed_factor,
+                end=seg['end'] * speed_factor,
+                text=seg['text'],
+                speaker=seg.get('speaker'),
+                confidence=seg.get('confidence'),
+            ))
+
+        return Transcript(
+            segments=segments,
+            language="he",
+            total_duration=total_duration,
+            speed_factor=speed_factor,
+        )
+
+    async def transcribe_async(
+        self,
+        video_path: str,
+        speed_up: bool = True,
+    ) -> Transcript:
+        """
+        Async variant of transcribe() for event-loop callers.
+
+        For the gemini method the upload/poll/generate sequence is fully
+        non-blocking, so several videos can share the network and the API
+        concurrently. Other methods (local Whisper is CPU/GPU-bound)
+        delegate to the sync path on a worker thread.
+        """
+        method = self.config['whisper'].get('method', 'local')
+        if method != "gemini":
+            return await asyncio.to_thread(self.transcribe, video_path, speed_up)
+
+        speed_factor = self.config['audio']['speed_factor'] if speed_up else 1.0
+
+        # Audio extraction and the duration probe are blocking ffmpeg
+        # calls; run both off the loop, the probe overlapping the API call.
+        audio_path = await asyncio.to_thread(
+            extract_audio_from_video,
             video_path=video_path,
             speed_factor=speed_factor,
             sample_rate=self.config['audio']['sample_rate'],
             channels=self.config['audio']['channels'],
+            codec="opus",
         )
 
-        # Step 2: Transcribe with Hebrew-optimized Whisper or Gemini
-        raw_segments = transcribe_hebrew(
+        from utils.ffmpeg_utils import get_video_duration
+
+        duration_task = asyncio.create_task(asyncio.to_thread(get_video_duration, video_path))
+
+        raw_segments = await transcribe_with_gemini_async(
             audio_path=audio_path,
             model_name=self.config['whisper']['model'],
-            device=self.config['whisper']['device'],
             language=self.config['whisper']['language'],
-            method=self.config['whisper'].get('method', 'local'),
         )
 
-        # Step 3: Adjust timestamps back to original video time
-        # If audio was sped up 2x, multiply timestamps by 2 to get original times
+        total_duration = await duration_task
+
+        # Timestamp adjustment identical to the sync path.
         segments = []
         for i, seg in enumerate(raw_segments):
-            segments.append(TranscriptSegment(
+            segments.append(TranscriptSegment.model_construct(
                 id=i,
                 start=seg['start'] * speed_factor,
                 end=seg['end'] * speed_factor,
@@ -79,10 +176,6 @@ class TranscriptionAgent:
                 confidence=seg.get('confidence'),
             ))
 
-        # Calculate total duration from original video
-        from utils.ffmpeg_utils import get_video_duration
-        total_duration = get_video_duration(video_path)
-
         return Transcript(
             segments=segments,
             language="he",
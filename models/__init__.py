@@ -3,6 +3,9 @@ AutoReel Agent - Data Models
 Pydantic models for type-safe data throughout the pipeline.
 """
 
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+
 from pydantic import BaseModel, Field
 from typing import Optional
 from enum import Enum
@@ -40,12 +43,36 @@ class Transcript(BaseModel):
     def full_text(self) -> str:
         return " ".join(seg.text for seg in self.segments)
 
+    @cached_property
+    def _start_times(self) -> list[float]:
+        """Segment start times, in transcript order (sorted by start)."""
+        return [seg.start for seg in self.segments]
+
+    @cached_property
+    def _max_end_prefix(self) -> list[float]:
+        """Running maximum of segment end times; handles overlapping segments."""
+        prefix = []
+        running = float("-inf")
+        for seg in self.segments:
+            if seg.end > running:
+                running = seg.end
+            prefix.append(running)
+        return prefix
+
     def get_segments_in_range(self, start: float, end: float) -> list[TranscriptSegment]:
-        """Get all segments that overlap with a time range."""
-        return [
-            seg for seg in self.segments
-            if seg.end > start and seg.start < end
-        ]
+        """
+        Get all segments that overlap with a time range.
+
+        Segments are sorted by start time, so binary search bounds the
+        candidate window instead of scanning the whole transcript on every
+        call (this runs once per clip and once per highlight).
+        """
+        # First index whose start is >= end: everything after can't overlap.
+        hi = bisect_left(self._start_times, end)
+        # First index whose running-max end exceeds start: everything
+        # before has already finished by `start`.
+        lo = bisect_right(self._max_end_prefix, start)
+        return [seg for seg in self.segments[lo:hi] if seg.end > start]
 
 
 class Highlight(BaseModel):
@@ -1,17 +1,66 @@
 import os
-import json
-import yaml
-from agents.editor_agent import EditorAgent
-from agents.subtitle_agent import SubtitleAgent
-from models import Transcript, Highlight, Platform
-from dotenv import load_dotenv
 
 import argparse
 from pathlib import Path
 
-def run_generation():
+def run(video_path: str, transcript=None, highlights=None,
+        transcript_path=None, highlights_path=None,
+        skip_resize: bool = True, config_path: str = "config/settings.yaml"):
+    """
+    Cut clips for the given highlights and burn subtitles; return the reels.
+
+    In-process entry point: run_pipeline.py passes the Transcript and
+    Highlight objects it already has, skipping the JSON round-trip. The
+    file-based flow passes transcript_path/highlights_path instead.
+    """
+    # Heavy imports live here so `--help` and bad-args exits
+    # don't pay for pydantic/agents (and their transitive deps).
+    from dotenv import load_dotenv
+
+    from agents.editor_agent import EditorAgent
+    from agents.subtitle_agent import SubtitleAgent
+    from models import Transcript, Highlight, Platform
+
     load_dotenv()
-    
+
+    if highlights is None:
+        from pydantic import TypeAdapter
+
+        print(f"📄 Loading highlights from: {highlights_path}")
+        # validate_json fuses JSON parse + validation in pydantic-core (Rust)
+        # instead of orjson.loads followed by per-model __init__.
+        highlights = TypeAdapter(list[Highlight]).validate_json(
+            Path(highlights_path).read_bytes()
+        )
+
+    if transcript is None:
+        print(f"📄 Loading transcript from: {transcript_path}")
+        transcript = Transcript.model_validate_json(Path(transcript_path).read_bytes())
+
+    print(f"✂️ Step 1: Cutting clips from the video...")
+    editor = EditorAgent(config_path=config_path)
+    # Use the dynamic skip_resize flag
+    clips = editor.process(video_path=video_path, highlights=highlights, skip_resize=skip_resize)
+    print(f"  ✅ Cut {len(clips)} clips")
+
+    print(f"📝 Step 2: Adding Hebrew subtitles...")
+    subtitle_agent = SubtitleAgent(config_path=config_path)
+    # For now, let's just generate for Instagram to save time, or use the config
+    platforms = [Platform.INSTAGRAM] # [Platform.INSTAGRAM, Platform.TIKTOK, Platform.YOUTUBE_SHORTS]
+
+    reels = subtitle_agent.process(
+        clips=clips,
+        transcript=transcript,
+        platforms=platforms
+    )
+
+    print(f"\n🚀 SUCCESS! Final reels generated:")
+    for reel in reels:
+        print(f"  ✅ {reel.path}")
+
+    return reels
+
+def run_generation():
     parser = argparse.ArgumentParser(description="Generate reels from highlights.")
     parser.add_argument("--highlights", "-h_file", type=str, help="Path to highlights JSON")
     parser.add_argument("--transcript", "-t", type=str, help="Path to transcript JSON")
@@ -20,54 +69,28 @@ def run_generation():
     parser.add_argument("--resize", action="store_true", help="Resize video to vertical if not already")
     args = parser.parse_args()
 
-    config_path = "config/settings.yaml"
-    
     # Default paths for backward compatibility or single-run workflow
     highlights_path = args.highlights or "output/highlights.json"
     transcript_path = args.transcript or "output/transcript.json"
     video_path = args.video or "output/full_video_vertical_mobile.mp4"
-    
+
     # Check if we should skip resize (default is True in legacy, but false if arg provided)
-    # Actually, let's inverse it: if --resize is passed, skip_resize=False. 
-    # If no video arg is passed, we assume the pre-processed "full_video_vertical_mobile.mp4" used in the original pipeline, 
+    # Actually, let's inverse it: if --resize is passed, skip_resize=False.
+    # If no video arg is passed, we assume the pre-processed "full_video_vertical_mobile.mp4" used in the original pipeline,
     # so we SKIP resize.
     # If a video arg IS passed (e.g. a split file), we probably want to resize it, so --resize should be used.
     skip_resize = not args.resize
-    
+
     if not os.path.exists(highlights_path):
         print(f"❌ Error: {highlights_path} not found. Run run_highlights.py first.")
         return
 
-    print(f"📄 Loading highlights from: {highlights_path}")
-    with open(highlights_path, 'r', encoding='utf-8') as f:
-        highlights_data = json.load(f)
-    highlights = [Highlight(**h) for h in highlights_data]
-
-    print(f"📄 Loading transcript from: {transcript_path}")
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        transcript_data = json.load(f)
-    transcript = Transcript(**transcript_data)
-
-    print(f"✂️ Step 1: Cutting clips from the video...")
-    editor = EditorAgent(config_path)
-    # Use the dynamic skip_resize flag
-    clips = editor.process(video_path=video_path, highlights=highlights, skip_resize=skip_resize)
-    print(f"  ✅ Cut {len(clips)} clips")
-
-    print(f"📝 Step 2: Adding Hebrew subtitles...")
-    subtitle_agent = SubtitleAgent(config_path)
-    # For now, let's just generate for Instagram to save time, or use the config
-    platforms = [Platform.INSTAGRAM] # [Platform.INSTAGRAM, Platform.TIKTOK, Platform.YOUTUBE_SHORTS]
-    
-    reels = subtitle_agent.process(
-        clips=clips,
-        transcript=transcript,
-        platforms=platforms
+    run(
+        video_path=video_path,
+        transcript_path=transcript_path,
+        highlights_path=highlights_path,
+        skip_resize=skip_resize,
     )
-    
-    print(f"\n🚀 SUCCESS! Final reels generated:")
-    for reel in reels:
-        print(f"  ✅ {reel.path}")
 
 if __name__ == "__main__":
     run_generation()
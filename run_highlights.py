@@ -1,25 +1,133 @@
+import heapq
 import os
-import json
-import yaml
-from agents.highlight_agent import HighlightAgent
-from models import Transcript
-from dotenv import load_dotenv
 
 import argparse
 from pathlib import Path
 
-def run_highlights():
+def run(transcript=None, transcript_path=None, output_path=None,
+        config_path: str = "config/settings.yaml"):
+    """
+    Detect, filter and rank highlights; return the final list.
+
+    In-process entry point: run_pipeline.py passes the Transcript object
+    it already has and skips the JSON round-trip. The file-based flow
+    passes transcript_path instead (and output_path to persist results).
+    """
+    # Heavy imports live here so `--help` and bad-args exits
+    # don't pay for pydantic/agents (and their transitive deps).
+    from dotenv import load_dotenv
+
+    from agents.highlight_agent import HighlightAgent
+    from models import Transcript
+
     load_dotenv()
-    
+
+    # Large file-based transcripts never go through pydantic at all: the
+    # streamed highlight pass below collects lightweight
+    # (start, end, speaker) spans that drive the filters, so thousands
+    # of segment model objects are never materialized.
+    stream_large = (
+        transcript is None
+        and transcript_path
+        and os.path.getsize(transcript_path) > 10 * 1024 * 1024
+    )
+
+    if transcript is None and not stream_large:
+        print(f"🔍 Loading transcript from: {transcript_path}")
+        # Fused JSON parse + validation in pydantic-core — no intermediate dict tree.
+        transcript = Transcript.model_validate_json(Path(transcript_path).read_bytes())
+
+    # Increase max_highlights if needed, or get from config
+    max_highlights = 10  # Get more candidates, then filter
+
+    if stream_large:
+        # Large transcript: stream the JSON into the prompt via ijson so
+        # the segments only ever exist one at a time.
+        print(f"🧠 Detecting highlights (streaming large transcript)...")
+        from agents._config import load_config
+        from skills.highlight_detection import detect_highlights_llm_streaming
+
+        config = load_config(config_path)
+        spans = []
+        highlights = detect_highlights_llm_streaming(
+            transcript_path=transcript_path,
+            model_name=config['highlight_detection']['model'],
+            max_highlights=max_highlights * 2,
+            min_duration=config['reels']['min_duration'],
+            max_duration=config['reels']['max_duration'],
+            min_score=config['highlight_detection'].get('min_virality_score', 6),
+            signals=config['highlight_detection']['signals'],
+            segment_spans=spans,
+        )
+        total_duration = max((end for _, end, _ in spans), default=0.0)
+
+        def speakers_in_range(start, end):
+            return [sp for s, e, sp in spans if s < end and e > start]
+    else:
+        print(f"🧠 Detecting highlights using HighlightAgent...")
+        agent = HighlightAgent(config_path=config_path)
+        highlights = agent.detect(transcript, max_highlights=max_highlights)
+        total_duration = transcript.total_duration
+
+        def speakers_in_range(start, end):
+            return [seg.speaker for seg in transcript.get_segments_in_range(start, end)]
+
+    # Filter out hallucinations (timestamps beyond video duration)
+    valid_highlights = [h for h in highlights if h.start < total_duration]
+
+    # NEW: Filter for single-speaker segments only
+    single_speaker_highlights = []
+    for h in valid_highlights:
+        # Get all speakers in this highlight's time range
+        speakers = speakers_in_range(h.start, h.end)
+        if not speakers:
+            continue
+
+        # Check if all segments have the same speaker — bail out on the
+        # first mismatch instead of materializing the full speaker set.
+        first_speaker = None
+        multi_speaker = False
+        for speaker in speakers:
+            if not speaker:
+                continue
+            if first_speaker is None:
+                first_speaker = speaker
+            elif speaker != first_speaker:
+                multi_speaker = True
+                break
+
+        if first_speaker is not None and not multi_speaker:  # Only one speaker throughout
+            single_speaker_highlights.append(h)
+            print(f"✅ Keeping highlight: {h.suggested_title} (Speaker: {first_speaker})")
+        else:
+            print(f"❌ Skipping multi-speaker highlight: {h.suggested_title}")
+
+    # Take top 5 by virality score — O(n log 5) instead of a full sort
+    highlights = heapq.nlargest(5, single_speaker_highlights, key=lambda x: x.virality_score)
+
+    print(f"✅ Found {len(highlights)} single-speaker highlights!")
+
+    if output_path is not None:
+        import orjson
+        # Save highlights (orjson always emits UTF-8, so Hebrew stays unescaped).
+        # Written atomically so partial files never count as done.
+        highlights_data = [h.model_dump(mode="json") for h in highlights]
+        tmp_path = f"{output_path}.tmp"
+        Path(tmp_path).write_bytes(orjson.dumps(highlights_data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, output_path)
+        print(f"📄 Saved highlights to: {output_path}")
+
+    return highlights
+
+def run_highlights():
     parser = argparse.ArgumentParser(description="Clean and extract highlights.")
     parser.add_argument("--transcript", "-t", type=str, help="Path to transcript JSON file")
     parser.add_argument("--output", "-o", type=str, help="Path to save highlights JSON")
     args = parser.parse_args()
 
-    config_path = "config/settings.yaml"
     # Default inputs if not provided
     transcript_path = args.transcript or "output/transcript.json"
-    
+
     # Determine output path based on input
     if args.output:
         output_path = args.output
@@ -29,55 +137,13 @@ def run_highlights():
         if not stem.startswith("highlights"):
             stem = f"highlights_{stem}"
         output_path = f"output/{stem}.json"
-    
+
     if not os.path.exists(transcript_path):
         print(f"❌ Error: Transcript file '{transcript_path}' not found.")
         return
 
-    print(f"🔍 Loading transcript from: {transcript_path}")
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        transcript_data = json.load(f)
-    
-    transcript = Transcript(**transcript_data)
-    
-    print(f"🧠 Detecting highlights using HighlightAgent...")
-    agent = HighlightAgent(config_path)
-    
-    # Increase max_highlights if needed, or get from config
-    max_highlights = 10  # Get more candidates, then filter
-    highlights = agent.detect(transcript, max_highlights=max_highlights)
+    highlights = run(transcript_path=transcript_path, output_path=output_path)
 
-    # Filter out hallucinations (timestamps beyond video duration)
-    valid_highlights = [h for h in highlights if h.start < transcript.total_duration]
-    
-    # NEW: Filter for single-speaker segments only
-    single_speaker_highlights = []
-    for h in valid_highlights:
-        # Get all segments in this highlight's time range
-        segments = transcript.get_segments_in_range(h.start, h.end)
-        if not segments:
-            continue
-        
-        # Check if all segments have the same speaker
-        speakers = set(seg.speaker for seg in segments if seg.speaker)
-        if len(speakers) == 1:  # Only one speaker throughout
-            single_speaker_highlights.append(h)
-            print(f"✅ Keeping highlight: {h.suggested_title} (Speaker: {speakers.pop()})")
-        else:
-            print(f"❌ Skipping multi-speaker highlight: {h.suggested_title}")
-    
-    # Take top 5 by virality score
-    highlights = sorted(single_speaker_highlights, key=lambda x: x.virality_score, reverse=True)[:5]
-
-    print(f"✅ Found {len(highlights)} single-speaker highlights!")
-    
-    # Save highlights
-    highlights_data = [h.model_dump() for h in highlights]
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(highlights_data, f, ensure_ascii=False, indent=2)
-        
-    print(f"📄 Saved highlights to: {output_path}")
-    
     # Print a summary
     for i, h in enumerate(highlights):
         print(f"\n--- Highlight #{i+1} ---")
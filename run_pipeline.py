@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Run the full transcription → highlights → generation pipeline in one process.
+
+Unlike running the three run_*.py scripts back to back, the Transcript
+and Highlight objects are handed between stages in memory — no
+intermediate JSON is serialized, written and re-parsed (the transcript
+is still saved to output/ as a byproduct for inspection and re-runs).
+
+Usage:
+    python run_pipeline.py --input path/to/video.mp4 [--resize]
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import run_transcription
+import run_highlights
+import run_generation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the full AutoReel pipeline in-process.")
+    parser.add_argument("--input", "-i", type=str, required=True, help="Path to the input video file")
+    parser.add_argument("--resize", action="store_true", help="Resize video to vertical if not already")
+    args = parser.parse_args()
+
+    video_path = args.input
+    os.makedirs("output", exist_ok=True)
+
+    stem = Path(video_path).stem
+
+    print(f"🎤 Step 1/3: Transcribing {video_path}")
+    transcript = run_transcription.run(
+        video_path,
+        output_path=f"output/transcript_{stem}.json",
+    )
+
+    print(f"🧠 Step 2/3: Detecting highlights")
+    highlights = run_highlights.run(transcript=transcript)
+
+    print(f"🎬 Step 3/3: Generating reels")
+    run_generation.run(
+        video_path=video_path,
+        transcript=transcript,
+        highlights=highlights,
+        skip_resize=not args.resize,
+    )
+
+
+if __name__ == "__main__":
+    main()
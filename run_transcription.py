@@ -1,16 +1,68 @@
 import os
 import sys
-import json
 from pathlib import Path
-import yaml
 
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.curdir))
 
-from agents.transcription_agent import TranscriptionAgent
-
 import argparse
 
+def run(video_path: str, output_path=None, config_path: str = "config/settings.yaml"):
+    """
+    Transcribe a video and return the Transcript object.
+
+    In-process entry point: run_pipeline.py calls this directly and keeps
+    the returned object, skipping the JSON round-trip entirely. Pass
+    output_path to also persist the transcript for the file-based flow.
+    """
+    # Heavy imports live here so `--help` and bad-args exits
+    # don't pay for the agent stack (pydantic, yaml, transformers lazily).
+    from agents.transcription_agent import TranscriptionAgent
+
+    agent = TranscriptionAgent(config_path=config_path)
+    transcript = agent.transcribe(
+        video_path=video_path,
+        speed_up=True # Uses 2x speed for faster compute as per config
+    )
+
+    if output_path is not None:
+        import orjson
+        # Atomic write: a crash mid-write must not leave a truncated file
+        # that later runs mistake for a finished transcript.
+        tmp_path = f"{output_path}.tmp"
+        Path(tmp_path).write_bytes(
+            orjson.dumps(transcript.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        )
+        os.replace(tmp_path, output_path)
+
+    return transcript
+
+async def run_async(video_path: str, output_path=None, config_path: str = "config/settings.yaml"):
+    """
+    Async variant of run() for event-loop callers (process_all_speakers.py).
+
+    With the gemini method the upload and generation are awaited rather
+    than blocking, so several transcriptions overlap on one loop.
+    """
+    from agents.transcription_agent import TranscriptionAgent
+
+    agent = TranscriptionAgent(config_path=config_path)
+    transcript = await agent.transcribe_async(
+        video_path=video_path,
+        speed_up=True # Uses 2x speed for faster compute as per config
+    )
+
+    if output_path is not None:
+        import orjson
+        # Atomic write, matching run().
+        tmp_path = f"{output_path}.tmp"
+        Path(tmp_path).write_bytes(
+            orjson.dumps(transcript.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        )
+        os.replace(tmp_path, output_path)
+
+    return transcript
+
 def main():
     parser = argparse.ArgumentParser(description="Run Hebrew transcription on a video file.")
     parser.add_argument("--input", "-i", type=str, help="Path to the input video file")
@@ -19,32 +71,24 @@ def main():
 
     # Default path if none provided
     video_path = args.input or "input/תזונת ילדים והחיים עצמם - פרק 1 - עריכה בסיסית.mp4"
-    config_path = "config/settings.yaml"
-    
+
     # Ensure background output directory exists for transcription artifacts
     os.makedirs("output", exist_ok=True)
-    
+
     print(f"🎤 Starting Hebrew transcription for: {video_path}")
     print("⏳ This uses Google Gemini API with speaker diarization...")
-    
+
     try:
-        agent = TranscriptionAgent(config_path)
-        transcript = agent.transcribe(
-            video_path=video_path,
-            speed_up=True # Uses 2x speed for faster compute as per config
-        )
-        
         # Save transcript to a JSON file for the next steps
         default_output = f"output/transcript_{Path(video_path).stem}.json"
         transcript_path = Path(args.output or default_output)
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript.model_dump_json(indent=2))
-            
+        transcript = run(video_path, output_path=transcript_path)
+
         print(f"✅ Transcription complete!")
         print(f"📄 Saved to: {transcript_path}")
         print(f"⏱️ Total duration: {transcript.total_duration:.2f}s")
         print(f"🔢 Segments: {len(transcript.segments)}")
-        
+
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
         import traceback
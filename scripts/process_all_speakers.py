@@ -4,30 +4,223 @@ Process All Speaker Videos
 --------------------------
 Iterates over all videos in output/speaker_split/ and runs the full AutoReel pipeline for each.
 
+Transcription and reel generation run as asyncio worker pools so several
+videos are in flight at once. Highlight detection sits between them as a
+single batched Gemini call covering every speaker: one network
+round-trip for the whole set instead of one per video.
+
+Stages call the run_*.py entry points in-process (via worker threads)
+rather than spawning `python run_*.py` subprocesses — one interpreter
+and one set of imports for the whole batch instead of a fresh ~300ms
+startup per video per stage.
+
 Usage:
-    python scripts/process_all_speakers.py
+    python scripts/process_all_speakers.py [--jobs N]
 """
 
+import argparse
+import asyncio
+import hashlib
+import heapq
 import os
-import subprocess
+import sys
 from pathlib import Path
+
+# Add project root to sys.path (script lives in scripts/)
+sys.path.append(os.path.abspath(os.curdir))
+
 from rich.console import Console
 
+import run_generation
+import run_transcription
+
 console = Console()
 
-def run_command(cmd_list):
-    """Run a command and check for errors."""
-    cmd_str = " ".join(cmd_list)
-    console.print(f"[bold cyan]Running:[/bold cyan] {cmd_str}")
+# Keep API-bound transcription concurrency low (Gemini rate limits);
+# ffmpeg-bound generation scales with cores via --jobs.
+TRANSCRIBE_WORKERS = 2
+
+def _source_tag(path: Path) -> str:
+    """
+    Short tag identifying a source file's current contents.
+
+    Hashes (size, mtime) rather than the bytes themselves — speaker
+    videos run to gigabytes and a full read per run would cost more than
+    the redundant work the tag is meant to skip.
+    """
+    st = path.stat()
+    return hashlib.blake2b(
+        f"{st.st_size}:{st.st_mtime_ns}".encode(), digest_size=4
+    ).hexdigest()
+
+def _is_fresh(dst: str, src: Path) -> bool:
+    """True if dst exists and is at least as new as src (safe to skip)."""
+    p = Path(dst)
+    return p.exists() and p.stat().st_mtime >= src.stat().st_mtime
+
+async def transcribe_one(video_path: Path) -> tuple:
+    # The source tag in the filename invalidates outputs when the video
+    # changes; the mtime check guards against stale or interrupted runs
+    # (run_transcription.py writes atomically, so a file that exists is
+    # complete).
+    transcript_json = f"output/transcript_{video_path.stem}_{_source_tag(video_path)}.json"
+    if not _is_fresh(transcript_json, video_path):
+        # Fully async for the gemini method: upload/poll/generate are
+        # awaited, so concurrent videos share the network and the API.
+        await run_transcription.run_async(str(video_path), output_path=transcript_json)
+    return video_path, transcript_json
+
+async def generate_one(item: tuple) -> Path:
+    video_path, transcript_json, highlights_json = item
+    # We assume the split videos are horizontal, so we force a resize to crop for 9:16
+    await asyncio.to_thread(
+        run_generation.run,
+        video_path=str(video_path),
+        transcript_path=transcript_json,
+        highlights_path=highlights_json,
+        skip_resize=False,
+    )
+    console.print(f"[green]✓ Finished:[/green] {video_path.name}")
+    return video_path
+
+def batch_highlight_stage(transcribed: list, failed: list) -> list:
+    """
+    Detect highlights for all transcribed videos with one Gemini call.
+
+    Videos whose highlights file already exists are passed through
+    untouched; the rest go into a single detect_highlights_llm_batch()
+    request and get their highlights JSON written here (top 5 in-range
+    candidates by virality score, matching run_highlights.py).
+
+    Returns the list of (video_path, transcript_json, highlights_json)
+    items ready for generation.
+    """
+    import orjson
+    from agents._config import load_config
+    from models import Transcript
+    from skills.highlight_detection import detect_highlights_llm_batch
+
+    items = []
+    pending = {}
+    transcripts = {}
+    for video_path, transcript_json in transcribed:
+        highlights_json = f"output/highlights_{video_path.stem}_{_source_tag(video_path)}.json"
+        if _is_fresh(highlights_json, Path(transcript_json)):
+            items.append((video_path, transcript_json, highlights_json))
+            continue
+        transcripts[video_path.stem] = Transcript.model_validate_json(
+            Path(transcript_json).read_bytes()
+        )
+        pending[video_path.stem] = (video_path, transcript_json, highlights_json)
+
+    if not pending:
+        return items
+
+    config = load_config("config/settings.yaml")
+    detection_config = config['highlight_detection']
+    reel_config = config['reels']
+
+    console.print(f"[cyan]🧠 Detecting highlights for {len(pending)} videos in one batch call...[/cyan]")
     try:
-        subprocess.run(cmd_list, check=True)
-    except subprocess.CalledProcessError:
-        console.print(f"[bold red]❌ Command failed:[/bold red] {cmd_str}")
-        raise
+        per_speaker = detect_highlights_llm_batch(
+            transcripts=transcripts,
+            model_name=detection_config['model'],
+            max_highlights=10,  # Request more to allow for filtering
+            min_duration=reel_config['min_duration'],
+            max_duration=reel_config['max_duration'],
+            min_score=detection_config.get('min_virality_score', 6),
+            signals=detection_config['signals'],
+        )
+    except Exception as e:
+        console.print(f"[bold red]❌ Batch highlight detection failed: {e}[/bold red]")
+        failed.extend(video_path for video_path, _, _ in pending.values())
+        return items
+
+    for stem, (video_path, transcript_json, highlights_json) in pending.items():
+        # Drop hallucinated timestamps, keep the top 5 by virality score
+        highlights = [
+            h for h in per_speaker.get(stem, [])
+            if h.start < transcripts[stem].total_duration
+        ]
+        highlights = heapq.nlargest(5, highlights, key=lambda h: h.virality_score)
+
+        if not highlights:
+            console.print(f"[yellow]No highlights returned for {video_path.name}[/yellow]")
+            failed.append(video_path)
+            continue
+
+        # Atomic write: partial files must never pass the freshness check.
+        tmp_path = f"{highlights_json}.tmp"
+        Path(tmp_path).write_bytes(
+            orjson.dumps([h.model_dump(mode="json") for h in highlights], option=orjson.OPT_INDENT_2)
+        )
+        os.replace(tmp_path, highlights_json)
+        items.append((video_path, transcript_json, highlights_json))
+
+    return items
+
+async def stage_worker(q_in, q_out, handler, failed):
+    """Consume items until a None sentinel, passing results downstream."""
+    while True:
+        item = await q_in.get()
+        if item is None:
+            return
+        try:
+            result = await handler(item)
+            if q_out is not None:
+                await q_out.put(result)
+        except Exception as e:
+            video = item if isinstance(item, Path) else item[0]
+            failed.append(video)
+            console.print(f"[bold red]❌ Failed:[/bold red] {video.name} ({e})")
+
+async def pipeline(videos, generate_workers: int) -> list:
+    q_transcribe = asyncio.Queue()
+    q_transcribed = asyncio.Queue()
+    q_generate = asyncio.Queue()
+    failed = []
+
+    # Stage 1: transcribe all videos (parallel worker threads)
+    transcribers = [
+        asyncio.create_task(stage_worker(q_transcribe, q_transcribed, transcribe_one, failed))
+        for _ in range(TRANSCRIBE_WORKERS)
+    ]
+    for video in videos:
+        q_transcribe.put_nowait(video)
+    for _ in transcribers:
+        q_transcribe.put_nowait(None)
+    await asyncio.gather(*transcribers)
+
+    transcribed = []
+    while not q_transcribed.empty():
+        transcribed.append(q_transcribed.get_nowait())
+
+    # Stage 2: one batched highlight-detection call for every transcript
+    items = await asyncio.to_thread(batch_highlight_stage, transcribed, failed)
+
+    # Stage 3: generate reels (parallel worker threads driving ffmpeg)
+    generators = [
+        asyncio.create_task(stage_worker(q_generate, None, generate_one, failed))
+        for _ in range(generate_workers)
+    ]
+    for item in items:
+        q_generate.put_nowait(item)
+    for _ in generators:
+        q_generate.put_nowait(None)
+    await asyncio.gather(*generators)
+
+    return failed
 
 def main():
+    parser = argparse.ArgumentParser(description="Process all speaker videos.")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Parallel generation workers (default: cpu count; transcription concurrency stays low for API rate limits)"
+    )
+    args = parser.parse_args()
+
     split_dir = Path("output/speaker_split")
-    
+
     if not split_dir.exists():
         console.print(f"[red]Error: {split_dir} does not exist. Run split_by_speaker.py first.[/red]")
         return
@@ -35,53 +228,21 @@ def main():
     # Find all mp4 files
     # We ignore files starting with "temp_" just in case there are leftovers
     videos = [f for f in split_dir.glob("*.mp4") if not f.name.startswith("temp_")]
-    
+
     if not videos:
         console.print(f"[yellow]No videos found in {split_dir}[/yellow]")
         return
-        
+
     console.print(f"[green]Found {len(videos)} speaker videos to process.[/green]")
-    
-    for video_path in videos:
-        stem = video_path.stem
-        console.print(f"\n[bold magenta]━━━━━━━━ Processing: {video_path.name} ━━━━━━━━[/bold magenta]")
-        
-        # 1. Transcription
-        transcript_json = f"output/transcript_{stem}.json"
-        if not Path(transcript_json).exists():
-            console.print(f"[blue]1. Transcribing...[/blue]")
-            run_command([
-                "python", "run_transcription.py",
-                "--input", str(video_path),
-                "--output", transcript_json
-            ])
-        else:
-            console.print(f"[dim]Skipping transcription (already exists)[/dim]")
-
-        # 2. Highlights
-        highlights_json = f"output/highlights_{stem}.json"
-        if not Path(highlights_json).exists():
-            console.print(f"[blue]2. Detecting Highlights...[/blue]")
-            run_command([
-                "python", "run_highlights.py",
-                "--transcript", transcript_json,
-                "--output", highlights_json
-            ])
-        else:
-            console.print(f"[dim]Skipping highlights (already exists)[/dim]")
-            
-        # 3. Reel Generation
-        # We assume the split videos are horizontal, so we force --resize to crop for 9:16
-        console.print(f"[blue]3. Generating Reels...[/blue]")
-        run_command([
-            "python", "run_generation.py",
-            "--highlights", highlights_json,
-            "--transcript", transcript_json,
-            "--video", str(video_path),
-            "--resize" 
-        ])
-        
-    console.print("\n[bold green]✅ All speaker videos processed![/bold green]")
+    os.makedirs("output", exist_ok=True)
+
+    generate_workers = args.jobs or max(1, min(len(videos), os.cpu_count() or 2))
+    failed = asyncio.run(pipeline(videos, generate_workers))
+
+    if failed:
+        console.print(f"\n[bold red]{len(failed)} video(s) failed.[/bold red]")
+    else:
+        console.print("\n[bold green]✅ All speaker videos processed![/bold green]")
 
 if __name__ == "__main__":
     main()
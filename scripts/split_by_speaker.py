@@ -5,10 +5,13 @@ Usage: python scripts/split_by_speaker.py <video_path>
 """
 
 import os
+import shutil
 import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from utils.video_analyzer import get_speaker_segments
-from utils.ffmpeg_utils import concat_segments_visual
+from utils.ffmpeg_utils import concat_segments_visual, concat_videos, segment_video_at_times
 from rich.console import Console
 from rich.progress import Progress
 
@@ -16,14 +19,94 @@ console = Console()
 
 import argparse
 
+def split_stream_copy(video_path, speaker_map, output_dir, video_stem):
+    """
+    Split speakers with one demux pass and zero re-encoding.
+
+    The source is stream-copied into parts at every speaker-change
+    boundary, then each speaker's parts are stitched with the concat
+    demuxer. Total work is O(video duration) I/O instead of one full
+    decode+encode pass per speaker. Cut points snap to keyframes, so
+    boundaries can drift up to one GOP; returns False when the part
+    layout doesn't match the requested boundaries (caller falls back to
+    the frame-accurate re-encode path).
+    """
+    boundaries = sorted({
+        round(t, 3)
+        for segs in speaker_map.values()
+        for seg in segs
+        for t in (seg['start'], seg['end'])
+    })
+    interior = [t for t in boundaries if t > 0]
+
+    parts_dir = output_dir / f"{video_stem}_parts"
+    parts = segment_video_at_times(video_path, interior, str(parts_dir))
+
+    # part i covers [starts[i], starts[i+1]) — only trustworthy when every
+    # requested boundary produced its own part.
+    starts = [0.0] + interior
+    if len(parts) != len(starts):
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        return False
+
+    try:
+        for speaker, speaker_segs in speaker_map.items():
+            speaker_parts = []
+            for seg in speaker_segs:
+                lo = bisect_left(starts, round(seg['start'], 3))
+                hi = bisect_left(starts, round(seg['end'], 3))
+                speaker_parts.extend(parts[lo:hi])
+
+            final_output = str(output_dir / f"{video_stem}_{speaker.replace(' ', '_')}.mp4")
+            concat_videos(speaker_parts, final_output)
+            console.print(f"  [green]✓[/green] Saved to: {final_output}")
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    return True
+
+def split_reencode(video_path, speaker_map, output_dir, video_stem):
+    """Frame-accurate fallback: one re-encoding concat per speaker, in parallel."""
+    # One ffmpeg process per speaker, run in parallel. Each process gets an
+    # even share of the cores via -threads so N concats don't oversubscribe.
+    n_jobs = min(len(speaker_map), os.cpu_count() or 1)
+    threads_per_job = max(1, (os.cpu_count() or 1) // n_jobs)
+
+    with Progress() as progress:
+        speaker_task = progress.add_task("[cyan]Processing speakers...", total=len(speaker_map))
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            futures = {}
+            for speaker, speaker_segs in speaker_map.items():
+                console.print(f"  [bold]Processing {speaker}...[/bold] ({len(speaker_segs)} segments)")
+
+                # Concatenate all clips for this speaker directly
+                final_output = str(output_dir / f"{video_stem}_{speaker.replace(' ', '_')}.mp4")
+                future = pool.submit(
+                    concat_segments_visual, video_path, speaker_segs, final_output,
+                    threads=threads_per_job,
+                )
+                futures[future] = (speaker, final_output)
+
+            for future in as_completed(futures):
+                speaker, final_output = futures[future]
+                try:
+                    future.result()
+                    progress.update(speaker_task, advance=1)
+                    console.print(f"  [green]✓[/green] Saved to: {final_output}")
+                except Exception as e:
+                    console.print(f"[red]Failed to process {speaker}: {e}[/red]")
+
 def main():
     parser = argparse.ArgumentParser(description="Split video by speaker.")
     parser.add_argument("video_path", type=str, help="Path to input video")
     parser.add_argument("--proxy", "-p", type=str, help="Path to smaller proxy video for analysis (optional)")
+    parser.add_argument("--exact", action="store_true",
+                        help="Frame-accurate cuts (re-encodes; default is fast keyframe-snapped stream copy)")
     args = parser.parse_args()
 
     video_path = args.video_path
-    
+
     if args.proxy:
         if not os.path.exists(args.proxy):
             console.print(f"[yellow]Warning: Proxy {args.proxy} not found. Using original.[/yellow]")
@@ -37,17 +120,17 @@ def main():
     video_stem = Path(video_path).stem
     output_dir = Path("output/speaker_split")
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+
     console.print(f"[bold blue]Analyzing video:[/bold blue] {analysis_video}")
-    
+
     # 1. Analyze segments
     # Use the analysis video (proxy or original)
     segments = get_speaker_segments(analysis_video, fps=0.5, threshold=40.0)
-    
+
     if not segments:
         console.print("[yellow]No segments found.[/yellow]")
         return
-        
+
     # Group segments by speaker
     speaker_map = {}
     for seg in segments:
@@ -55,25 +138,18 @@ def main():
         if speaker not in speaker_map:
             speaker_map[speaker] = []
         speaker_map[speaker].append(seg)
-        
+
     console.print(f"[green]Found {len(speaker_map)} speakers/scenes.[/green]")
-    
+
     # 2. Extract and Concatenate
-    with Progress() as progress:
-        speaker_task = progress.add_task("[cyan]Processing speakers...", total=len(speaker_map))
-        
-        for speaker, speaker_segs in speaker_map.items():
-            console.print(f"  [bold]Processing {speaker}...[/bold] ({len(speaker_segs)} segments)")
-            
-            # Concatenate all clips for this speaker directly
-            final_output = str(output_dir / f"{video_stem}_{speaker.replace(' ', '_')}.mp4")
-            
-            try:
-                concat_segments_visual(video_path, speaker_segs, final_output)
-                progress.update(speaker_task, advance=1)
-                console.print(f"  [green]✓[/green] Saved to: {final_output}")
-            except Exception as e:
-                console.print(f"[red]Failed to process {speaker}: {e}[/red]")
+    done = False
+    if not args.exact:
+        try:
+            done = split_stream_copy(video_path, speaker_map, output_dir, video_stem)
+        except Exception as e:
+            console.print(f"[yellow]Stream-copy split failed ({e}); re-encoding instead.[/yellow]")
+    if not done:
+        split_reencode(video_path, speaker_map, output_dir, video_stem)
 
     console.print(f"\n[bold green]Success![/bold green] All speaker files saved in {output_dir}")
 
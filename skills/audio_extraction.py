@@ -6,7 +6,7 @@ Supports optional speedup (2x) to reduce transcription compute.
 """
 
 from typing import Optional
-from utils.ffmpeg_utils import extract_audio
+from utils.ffmpeg_utils import extract_audio, extract_audio_array
 
 
 def extract_audio_from_video(
@@ -15,6 +15,7 @@ def extract_audio_from_video(
     sample_rate: int = 16000,
     channels: int = 1,
     output_path: Optional[str] = None,
+    codec: str = "pcm",
 ) -> str:
     """
     Extract audio-only from video, optimized for Whisper transcription.
@@ -23,6 +24,7 @@ def extract_audio_from_video(
     - No video data processed (audio-only extraction)
     - Optional speed-up (default 2x) halves compute time
     - Mono 16kHz output - optimal for Whisper
+    - Optional opus compression (~40x smaller) for upload-bound API paths
 
     Args:
         video_path: Path to input video
@@ -30,9 +32,10 @@ def extract_audio_from_video(
         sample_rate: Output sample rate (16000 optimal for Whisper)
         channels: Audio channels (1 = mono)
         output_path: Optional custom output path
+        codec: "pcm" (.wav) or "opus" (12 kbps .ogg)
 
     Returns:
-        Path to the extracted audio file (.wav)
+        Path to the extracted audio file (.wav or .ogg)
     """
     return extract_audio(
         video_path=video_path,
@@ -40,4 +43,34 @@ def extract_audio_from_video(
         speed_factor=speed_factor,
         sample_rate=sample_rate,
         channels=channels,
+        codec=codec,
+    )
+
+
+def extract_audio_array_from_video(
+    video_path: str,
+    speed_factor: float = 2.0,
+    sample_rate: int = 16000,
+    channels: int = 1,
+):
+    """
+    Extract audio as an in-memory waveform, skipping the .wav round-trip.
+
+    ffmpeg's PCM output is piped straight into a NumPy array that Whisper
+    can consume directly — no temp file written, read, or cleaned up.
+
+    Args:
+        video_path: Path to input video
+        speed_factor: Audio speed multiplier (2.0 = 2x faster, halves compute)
+        sample_rate: Output sample rate (16000 optimal for Whisper)
+        channels: Audio channels (1 = mono)
+
+    Returns:
+        1-D numpy float32 array in [-1, 1]
+    """
+    return extract_audio_array(
+        video_path=video_path,
+        speed_factor=speed_factor,
+        sample_rate=sample_rate,
+        channels=channels,
     )
@@ -3,7 +3,15 @@ Skill: Clip Extraction
 Cut precise video segments at given start/end timestamps using FFmpeg.
 """
 
-from utils.ffmpeg_utils import cut_clip
+from typing import Optional
+
+from utils.ffmpeg_utils import (
+    cut_clip,
+    cut_clip_segmented,
+    cut_and_resize_vertical,
+    cut_clips_batch,
+    split_into_gop_segments,
+)
 
 
 def extract_clip(
@@ -11,21 +19,34 @@ def extract_clip(
     output_path: str,
     start: float,
     end: float,
+    segments_dir: Optional[str] = None,
 ) -> str:
     """
     Extract a video clip at precise timestamps.
 
-    Uses FFmpeg re-encoding for frame-accurate cuts.
+    By default uses FFmpeg re-encoding for frame-accurate cuts. If the
+    source was pre-split with prepare_segments(), pass segments_dir to
+    assemble the clip from stream-copied segments instead — only the
+    sub-segment head and tail get re-encoded.
 
     Args:
         video_path: Path to source video
         output_path: Path for output clip
         start: Start time in seconds
         end: End time in seconds
+        segments_dir: Optional directory of pre-split GOP segments
 
     Returns:
         Path to the extracted clip
     """
+    if segments_dir is not None:
+        return cut_clip_segmented(
+            video_path=video_path,
+            output_path=output_path,
+            start=start,
+            end=end,
+            segments_dir=segments_dir,
+        )
     return cut_clip(
         video_path=video_path,
         output_path=output_path,
@@ -33,3 +54,82 @@ def extract_clip(
         end=end,
         reencode=True,  # Frame-accurate
     )
+
+
+def prepare_segments(video_path: str, segment_time: float = 2.0) -> str:
+    """
+    One-time pre-split of a source video into short GOP-aligned segments.
+
+    Run once per source; extract_clip(..., segments_dir=...) then cuts
+    clips copy-bound instead of encode-bound.
+
+    Args:
+        video_path: Path to source video
+        segment_time: Target segment length in seconds
+
+    Returns:
+        Path to the segments directory
+    """
+    return split_into_gop_segments(video_path, segment_time=segment_time)
+
+
+def extract_and_resize(
+    video_path: str,
+    output_path: str,
+    start: float,
+    end: float,
+) -> str:
+    """
+    Extract a clip and resize it to vertical 9:16 in one FFmpeg invocation.
+
+    Avoids the intermediate horizontal clip file that a separate
+    extract-then-resize sequence would write and re-read.
+
+    Args:
+        video_path: Path to source video
+        output_path: Path for output vertical clip
+        start: Start time in seconds
+        end: End time in seconds
+
+    Returns:
+        Path to the extracted vertical clip
+    """
+    return cut_and_resize_vertical(
+        video_path=video_path,
+        output_path=output_path,
+        start=start,
+        end=end,
+    )
+
+
+def extract_clips_batch(
+    video_path: str,
+    jobs: list,
+    vertical: bool = True,
+    hardware: str = "cpu",
+    stream_copy: bool = False,
+) -> list:
+    """
+    Extract multiple clips from one source in a single FFmpeg invocation.
+
+    The source container is opened and demuxed once for all clips,
+    amortizing seek/decode cost across the whole batch.
+
+    Args:
+        video_path: Path to source video
+        jobs: List of (start, end, output_path) tuples
+        vertical: If True, crop/scale each clip to vertical 9:16
+        hardware: "cpu" (libx264) or "cuda" (NVDEC/NVENC)
+        stream_copy: If True, stream-copy without re-encoding (cut points
+            must be keyframe-aligned; vertical filter is skipped)
+
+    Returns:
+        List of output paths, in job order
+    """
+    return cut_clips_batch(
+        video_path=video_path,
+        jobs=jobs,
+        vertical=vertical,
+        hardware=hardware,
+        stream_copy=stream_copy,
+    )
@@ -4,11 +4,163 @@ Use Gemini LLM to analyze a Hebrew podcast transcript and identify
 the most engaging, quotable, and viral-worthy moments.
 """
 
-import json
+import hashlib
+import os
+import time
+from pathlib import Path
 from typing import Optional
 
 from models import Transcript, Highlight
 
+# On-disk cache of Gemini responses, keyed by prompt hash. During prompt
+# iteration and pipeline debugging the same transcript gets re-sent over
+# and over; a hit skips the network + LLM round-trip entirely.
+# Disable with AUTOREEL_GEMINI_CACHE=0; entries expire after the TTL.
+GEMINI_CACHE_DIR = Path(".cache/gemini")
+GEMINI_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("AUTOREEL_GEMINI_CACHE", "1") != "0"
+
+
+# Gemini explicit context caches for transcript bodies, keyed by
+# (model, transcript hash). Cached input tokens are billed at ~10% of the
+# normal rate and skip re-upload, so repeated highlight passes over the
+# same transcript (prompt iteration, different parameters) only pay for
+# the short instruction block. Only worthwhile above Gemini's ~2048-token
+# minimum cacheable size. Each entry is (cache_handle, refresh_deadline):
+# handles are recreated shortly before their server-side TTL so a call
+# never goes out against an already-expired cache.
+_CONTEXT_CACHES: dict = {}
+_MIN_CONTEXT_CACHE_CHARS = 8192
+_CONTEXT_CACHE_TTL = 10 * 60  # seconds, sent to the API on create
+_CONTEXT_CACHE_MARGIN = 30  # recreate this many seconds before expiry
+
+# Inline placeholder used when the transcript lives in the context cache.
+_CACHED_TRANSCRIPT_NOTE = "(התמלול המלא צורף כהקשר שמור — קרא אותו משם)"
+
+
+def _prepare_model(
+    model_name: str, transcript_text: str, use_context_cache: bool = True
+) -> tuple:
+    """
+    Return (model, inline_text, cache_key) for a highlight call.
+
+    Long transcripts are pushed into a Gemini context cache and replaced
+    inline by a short note; short ones (or when the caching API is
+    unavailable, or use_context_cache is False) are sent inline as
+    before. cache_key disambiguates the on-disk response cache when the
+    prompt no longer embeds the text.
+    """
+    from utils.gemini_utils import configure_gemini, get_model
+
+    genai = configure_gemini()
+
+    if use_context_cache and len(transcript_text) >= _MIN_CONTEXT_CACHE_CHARS:
+        digest = hashlib.blake2b(transcript_text.encode()).hexdigest()
+        key = (model_name, digest)
+        entry = _CONTEXT_CACHES.get(key)
+        if entry is not None and time.monotonic() >= entry[1]:
+            # Past the refresh deadline — the server-side cache is gone
+            # (or about to be); drop the stale handle and recreate.
+            _CONTEXT_CACHES.pop(key, None)
+            entry = None
+        if entry is None:
+            try:
+                import datetime
+                from google.generativeai import caching
+
+                cache = caching.CachedContent.create(
+                    model=model_name,
+                    contents=[transcript_text],
+                    ttl=datetime.timedelta(seconds=_CONTEXT_CACHE_TTL),
+                )
+                entry = (
+                    cache,
+                    time.monotonic() + _CONTEXT_CACHE_TTL - _CONTEXT_CACHE_MARGIN,
+                )
+                _CONTEXT_CACHES[key] = entry
+            except Exception:
+                entry = None
+        if entry is not None:
+            model = genai.GenerativeModel.from_cached_content(cached_content=entry[0])
+            return model, _CACHED_TRANSCRIPT_NOTE, digest
+
+    return get_model(model_name), transcript_text, ""
+
+
+def _generate_json(model, prompt: str, cache_key: str = "", model_name: str = "") -> dict:
+    """Call Gemini in JSON mode, memoized on disk by model + prompt (+context) hash."""
+    import orjson
+
+    digest = hashlib.blake2b((model_name + cache_key + prompt).encode()).hexdigest()
+    cached = GEMINI_CACHE_DIR / f"{digest}.json"
+
+    if _cache_enabled() and cached.exists():
+        if time.time() - cached.stat().st_mtime < GEMINI_CACHE_TTL:
+            return orjson.loads(cached.read_bytes())
+
+    # Stream the response so chunks are consumed as they arrive instead
+    # of the SDK materializing the full answer first; for long outputs
+    # (many Hebrew highlight objects) this overlaps transfer with
+    # client-side assembly. The JSON is parsed the moment the last chunk
+    # lands. No early exit: the full body is needed for the disk cache,
+    # and truncating mid-stream would leave invalid JSON.
+    stream = model.generate_content(
+        prompt,
+        stream=True,
+        generation_config={
+            "temperature": 0.7,
+            "response_mime_type": "application/json",
+        },
+    )
+    text = "".join(chunk.text for chunk in stream)
+
+    # orjson parses the (potentially multi-KB, Hebrew-heavy) JSON answer
+    # several times faster than stdlib json.
+    result = orjson.loads(text)
+
+    if _cache_enabled():
+        GEMINI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached.write_text(text, encoding='utf-8')
+
+    return result
+
+
+async def _generate_json_async(model, prompt: str, cache_key: str = "", model_name: str = "") -> dict:
+    """Async twin of _generate_json: awaits the API call, same disk cache."""
+    import orjson
+
+    digest = hashlib.blake2b((model_name + cache_key + prompt).encode()).hexdigest()
+    cached = GEMINI_CACHE_DIR / f"{digest}.json"
+
+    if _cache_enabled() and cached.exists():
+        if time.time() - cached.stat().st_mtime < GEMINI_CACHE_TTL:
+            return orjson.loads(cached.read_bytes())
+
+    # Streamed like the sync path; chunks are awaited as they arrive.
+    stream = await model.generate_content_async(
+        prompt,
+        stream=True,
+        generation_config={
+            "temperature": 0.7,
+            "response_mime_type": "application/json",
+        },
+    )
+    parts = []
+    async for chunk in stream:
+        parts.append(chunk.text)
+    text = "".join(parts)
+
+    result = orjson.loads(text)
+
+    if _cache_enabled():
+        GEMINI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached.write_text(text, encoding='utf-8')
+
+    return result
+
 
 HIGHLIGHT_PROMPT = """
 אתה עורך תוכן בכיר (Senior Content Editor) המתמחה ביצירת רילס ויראליים חינוכיים ומעוררי השראה.
@@ -56,6 +208,147 @@ HIGHLIGHT_PROMPT = """
 """
 
 
+BATCH_HIGHLIGHT_PROMPT = """
+אתה עורך תוכן בכיר (Senior Content Editor) המתמחה ביצירת רילס ויראליים חינוכיים ומעוררי השראה.
+
+קיבלת תמלולים של כמה דוברים שונים. כל תמלול מופרד בשורת כותרת בפורמט:
+### SPEAKER <name> ###
+
+המשימה שלך: עבור כל דובר **בנפרד**, אתר ו"זקק" את {max_highlights} הרגעים המלמדים, המעמיקים והחכמים ביותר מתוך התמלול שלו.
+
+קריטריונים לבחירה (זהים לכל דובר):
+1. **ערך לימודי גבוה**: הסברים שמשנים תפיסה, עצות פרקטיות, תובנות עמוקות. הימנע מקלישאות.
+2. **ניקיון הקליפ**: דיבור רצוף, בלי לחתוך באמצע משפט, בלי הפרעות.
+3. **מבנה ויראלי**: הוק חזק בפתיחה; אורך {min_duration} עד {max_duration} שניות; הקטע מובן ב-100% ללא הקשר.
+4. **אריזה שיווקית**: כותרת קצרה ומסקרנת + נימוק לבחירה.
+
+חשוב: חותמות הזמן של כל דובר מתייחסות לסרטון שלו בלבד — אל תערבב בין דוברים.
+
+להלן התמלולים:
+{transcript_text}
+
+פלט נדרש (JSON):
+{{
+    "per_speaker": {{
+        "<name>": [
+            {{
+                "start": <start_seconds>,
+                "end": <end_seconds>,
+                "text": "<טקסט התמלול>",
+                "virality_score": <1-10>,
+                "reason": "<נימוק: מה ה-Insight המרכזי כאן?>",
+                "suggested_title": "<כותרת לימודית מסקרנת>",
+                "signals": ["educational_value", "insight", "practical_advice"]
+            }}
+        ]
+    }}
+}}
+"""
+
+
+# Every detect variant goes through the same prepare/format/call/parse
+# path below; the variants themselves only choose a template and how the
+# transcript text is produced. New prompt styles get added here, and
+# optimizations (context cache, disk cache, orjson) land in one place.
+PROMPT_TEMPLATES = {
+    "single": HIGHLIGHT_PROMPT,
+    "batch": BATCH_HIGHLIGHT_PROMPT,
+}
+
+
+def _build_call(
+    prompt_style: str,
+    transcript_text: str,
+    model_name: str,
+    max_highlights: int,
+    min_duration: int,
+    max_duration: int,
+    use_context_cache: bool = True,
+) -> tuple:
+    """Shared request prep: returns (model, prompt, cache_key)."""
+    model, inline_text, cache_key = _prepare_model(
+        model_name, transcript_text, use_context_cache
+    )
+    prompt = PROMPT_TEMPLATES[prompt_style].format(
+        max_highlights=max_highlights,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        transcript_text=inline_text,
+    )
+    return model, prompt, cache_key
+
+
+def _run_call(prompt_style: str, transcript_text: str, model_name: str,
+              max_highlights: int, min_duration: int, max_duration: int) -> dict:
+    """
+    Build and run a highlight call, retrying inline on cache errors.
+
+    If the first attempt went out against a context cache and failed —
+    e.g. the server-side cache expired between the local deadline check
+    and the call — the stale handle is evicted and the request is resent
+    once with the full transcript inline, so a dead cache is never worse
+    than the no-cache baseline.
+    """
+    args = (prompt_style, transcript_text, model_name,
+            max_highlights, min_duration, max_duration)
+    model, prompt, cache_key = _build_call(*args)
+    try:
+        return _generate_json(model, prompt, cache_key, model_name)
+    except Exception:
+        if not cache_key:
+            raise
+        _CONTEXT_CACHES.pop((model_name, cache_key), None)
+        model, prompt, cache_key = _build_call(*args, use_context_cache=False)
+        return _generate_json(model, prompt, cache_key, model_name)
+
+
+async def _run_call_async(prompt_style: str, transcript_text: str, model_name: str,
+                          max_highlights: int, min_duration: int, max_duration: int) -> dict:
+    """Async twin of _run_call: same inline retry on cache errors."""
+    args = (prompt_style, transcript_text, model_name,
+            max_highlights, min_duration, max_duration)
+    model, prompt, cache_key = _build_call(*args)
+    try:
+        return await _generate_json_async(model, prompt, cache_key, model_name)
+    except Exception:
+        if not cache_key:
+            raise
+        _CONTEXT_CACHES.pop((model_name, cache_key), None)
+        model, prompt, cache_key = _build_call(*args, use_context_cache=False)
+        return await _generate_json_async(model, prompt, cache_key, model_name)
+
+
+# Last formatted transcript, kept by identity. Repeated highlight passes
+# over the same Transcript (rerun after a parse failure, different
+# parameters) reuse the rendered text instead of walking every segment
+# again; the strong reference makes identity comparison safe against
+# id() reuse.
+_LAST_FORMATTED: tuple = (None, "")
+
+
+def _format_transcript_text(transcript: Transcript) -> str:
+    """Render a transcript as prompt lines: [MM:SS] (speaker) text."""
+    global _LAST_FORMATTED
+    if _LAST_FORMATTED[0] is transcript:
+        return _LAST_FORMATTED[1]
+
+    # Bound method of a single format string: one C-level call per segment
+    # instead of re-evaluating f-string formatting bytecode 1000s of times.
+    # divmod computes minutes and seconds in one op.
+    fmt = "[%02d:%02d] %s%s".__mod__
+    text = "\n".join([
+        fmt((
+            *divmod(int(seg.start), 60),
+            f"({seg.speaker}) " if seg.speaker else "",
+            seg.text,
+        ))
+        for seg in transcript.segments
+    ])
+
+    _LAST_FORMATTED = (transcript, text)
+    return text
+
+
 def detect_highlights_llm(
     transcript: Transcript,
     model_name: str = "gemini-2.0-flash-exp",
@@ -78,42 +371,145 @@ def detect_highlights_llm(
         signals: Engagement signals to look for
         focus_speaker: Optional speaker name (e.g. "Speaker A") to prioritize
     """
-    import google.generativeai as genai
-    import os
+    # Build transcript text with timestamps and speaker labels
+    transcript_text = _format_transcript_text(transcript)
+
+    # Call Gemini (served from the on-disk cache for repeated prompts)
+    result = _run_call(
+        "single", transcript_text, model_name,
+        max_highlights, min_duration, max_duration,
+    )
+    return _parse_highlights(result, min_score)
 
-    # Configure Gemini
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel(model_name)
 
-    # Build transcript text with timestamps and speaker labels
-    transcript_lines = []
-    for seg in transcript.segments:
-        minutes = int(seg.start // 60)
-        seconds = int(seg.start % 60)
-        speaker_part = f"({seg.speaker}) " if seg.speaker else ""
-        transcript_lines.append(f"[{minutes:02d}:{seconds:02d}] {speaker_part}{seg.text}")
+async def detect_highlights_llm_async(
+    transcript: Transcript,
+    model_name: str = "gemini-2.0-flash-exp",
+    max_highlights: int = 5,
+    min_duration: int = 30,
+    max_duration: int = 90,
+    min_score: int = 6,
+    signals: Optional[list[str]] = None,
+) -> list[Highlight]:
+    """
+    Async variant of detect_highlights_llm for event-loop callers.
 
-    transcript_text = "\n".join(transcript_lines)
+    The Gemini call is awaited via generate_content_async instead of
+    blocking, so several transcripts can be gathered concurrently
+    (asyncio.gather) on one loop — useful when per-video calls are
+    preferred over the single batched prompt.
 
-    # Build prompt
-    prompt = HIGHLIGHT_PROMPT.format(
-        max_highlights=max_highlights,
-        min_duration=min_duration,
-        max_duration=max_duration,
-        transcript_text=transcript_text,
+    Args as in detect_highlights_llm.
+    """
+    transcript_text = _format_transcript_text(transcript)
+
+    result = await _run_call_async(
+        "single", transcript_text, model_name,
+        max_highlights, min_duration, max_duration,
     )
+    return _parse_highlights(result, min_score)
 
-    # Call Gemini
-    response = model.generate_content(
-        prompt,
-        generation_config={
-            "temperature": 0.7,
-            "response_mime_type": "application/json",
-        },
+
+def detect_highlights_llm_batch(
+    transcripts: dict[str, Transcript],
+    model_name: str = "gemini-2.0-flash-exp",
+    max_highlights: int = 5,
+    min_duration: int = 30,
+    max_duration: int = 90,
+    min_score: int = 6,
+    signals: Optional[list[str]] = None,
+) -> dict[str, list[Highlight]]:
+    """
+    Detect highlights for several transcripts in a single Gemini call.
+
+    N separate calls cost N x (network round-trip + LLM queue time);
+    concatenating the transcripts with ### SPEAKER <name> ### delimiters
+    and asking for a per-speaker JSON answer amortizes that to one
+    round-trip for the whole batch of speaker videos.
+
+    Args:
+        transcripts: Mapping of speaker/video name -> Transcript
+        (remaining args as in detect_highlights_llm, applied per speaker)
+
+    Returns:
+        Mapping of name -> list of Highlights (empty list if the model
+        returned nothing for that name)
+    """
+    parts = []
+    for name, transcript in transcripts.items():
+        parts.append(f"### SPEAKER {name} ###")
+        parts.append(_format_transcript_text(transcript))
+
+    # The concatenated batch easily clears the context-cache minimum, so
+    # re-running the batch (e.g. after a parse failure) reuses the cache.
+    result = _run_call(
+        "batch", "\n".join(parts), model_name,
+        max_highlights, min_duration, max_duration,
+    )
+    per_speaker = result.get("per_speaker", {})
+
+    return {
+        name: _parse_highlights({"highlights": per_speaker.get(name, [])}, min_score)
+        for name in transcripts
+    }
+
+
+def detect_highlights_llm_streaming(
+    transcript_path: str,
+    model_name: str = "gemini-2.0-flash-exp",
+    max_highlights: int = 5,
+    min_duration: int = 30,
+    max_duration: int = 90,
+    min_score: int = 6,
+    signals: Optional[list[str]] = None,
+    segment_spans: Optional[list] = None,
+) -> list[Highlight]:
+    """
+    Detect highlights from a transcript JSON file without materializing it.
+
+    Streams segments straight off disk with ijson and writes the prompt
+    lines into a StringIO buffer — no Pydantic models and no list of
+    thousands of segment objects are held in memory. Meant for long
+    transcripts where the parsed Transcript dominates peak RSS.
+
+    Args:
+        transcript_path: Path to a transcript JSON file on disk
+        segment_spans: Optional list the streamed pass fills with one
+            (start, end, speaker) tuple per segment, so callers can run
+            range/speaker filters without parsing the file again
+        (remaining args as in detect_highlights_llm)
+    """
+    import io
+
+    import ijson
+
+    # Stream segments into the prompt buffer one at a time
+    buf = io.StringIO()
+    with open(transcript_path, "rb") as f:
+        for seg in ijson.items(f, "segments.item"):
+            start = float(seg["start"])
+            minutes = int(start // 60)
+            seconds = int(start % 60)
+            speaker = seg.get("speaker")
+            if segment_spans is not None:
+                segment_spans.append((start, float(seg.get("end", start)), speaker))
+            buf.write(f"[{minutes:02d}:{seconds:02d}] ")
+            if speaker:
+                buf.write(f"({speaker}) ")
+            buf.write(seg["text"])
+            buf.write("\n")
+
+    # Transcripts on this path are large by definition, so they always
+    # land in the context cache when the API is available.
+    result = _run_call(
+        "single", buf.getvalue(), model_name,
+        max_highlights, min_duration, max_duration,
     )
+    return _parse_highlights(result, min_score)
+
 
-    # Parse response
-    result = json.loads(response.text)
+def _parse_highlights(result: dict, min_score: int) -> list[Highlight]:
+    """Turn a Gemini JSON response into Highlight models, dropping low scores."""
     highlights = []
 
     for i, h in enumerate(result.get("highlights", [])):
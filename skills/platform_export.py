@@ -3,11 +3,12 @@ Skill: Platform Export
 Format final clips per platform specification (duration, resolution, codec).
 """
 
-from pathlib import Path
+import os
+import types
 from typing import Optional
 
-# Platform specs
-PLATFORM_SPECS = {
+# Platform specs — frozen at import so no call path can mutate them
+PLATFORM_SPECS = types.MappingProxyType({
     "instagram": {
         "max_duration": 90,
         "aspect_ratio": "9:16",
@@ -32,6 +33,13 @@ PLATFORM_SPECS = {
         "audio_codec": "aac",
         "max_file_size_mb": 256,
     },
+})
+
+# Byte thresholds derived once at import; the size check compares raw
+# st_size against these instead of converting to MB per call.
+_PLATFORM_MAX_BYTES = {
+    name: spec["max_file_size_mb"] * 1024 * 1024
+    for name, spec in PLATFORM_SPECS.items()
 }
 
 
@@ -42,32 +50,41 @@ def get_platform_spec(platform: str) -> dict:
     return PLATFORM_SPECS[platform]
 
 
-def validate_for_platform(video_path: str, platform: str) -> dict:
+def validate_for_platform(video_path: str, platform: str, info: Optional[dict] = None) -> dict:
     """
     Validate a video file against platform requirements.
 
     Args:
         video_path: Path to video file
         platform: Platform name
+        info: Optional pre-fetched ffprobe dict (get_video_info). Callers
+            that already probed the file pass it here and skip the
+            subprocess spawn entirely.
 
     Returns:
         Dict with validation results: {valid: bool, issues: list[str]}
     """
-    from utils.ffmpeg_utils import get_video_duration, get_video_info
-
     spec = get_platform_spec(platform)
     issues = []
 
-    # Check duration
-    duration = get_video_duration(video_path)
+    # Check duration (from the caller's probe when available; otherwise
+    # one cached ffprobe call per file)
+    if info is not None:
+        duration = float(info["format"]["duration"])
+    else:
+        from utils.ffmpeg_utils import get_video_duration
+
+        duration = get_video_duration(video_path)
     if duration > spec["max_duration"]:
         issues.append(
             f"Duration {duration:.0f}s exceeds {platform} max of {spec['max_duration']}s"
         )
 
-    # Check file size
-    file_size_mb = Path(video_path).stat().st_size / (1024 * 1024)
-    if file_size_mb > spec["max_file_size_mb"]:
+    # Check file size — a single stat syscall, compared in raw bytes
+    # against the threshold precomputed at import
+    size_bytes = os.stat(video_path).st_size
+    file_size_mb = size_bytes / (1024 * 1024)
+    if size_bytes > _PLATFORM_MAX_BYTES[platform]:
         issues.append(
             f"File size {file_size_mb:.1f}MB exceeds {platform} max of {spec['max_file_size_mb']}MB"
         )
@@ -78,3 +95,35 @@ def validate_for_platform(video_path: str, platform: str) -> dict:
         "duration": duration,
         "file_size_mb": file_size_mb,
     }
+
+
+def validate_many(paths: list[str], platforms: list[str]) -> dict:
+    """
+    Validate a batch of clips against several platforms in parallel.
+
+    ffprobe is subprocess-bound and releases the GIL, so a thread pool
+    scales N sequential probe spawns into concurrent ones; each file is
+    probed once and its info dict reused across every platform check.
+
+    Args:
+        paths: Video files to validate
+        platforms: Platform names to check each file against
+
+    Returns:
+        Dict of {(path, platform): validation result}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from utils.ffmpeg_utils import get_video_info
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 2) * 4)) as pool:
+        # One probe per file, all in flight at once
+        infos = dict(zip(paths, pool.map(get_video_info, paths)))
+        futures = {
+            (path, platform): pool.submit(
+                validate_for_platform, path, platform, infos[path]
+            )
+            for path in paths
+            for platform in platforms
+        }
+        return {key: future.result() for key, future in futures.items()}
@@ -10,6 +10,7 @@ def burn_subtitles_into_video(
     video_path: str,
     subtitle_path: str,
     output_path: str,
+    hardware: str = "cpu",
 ) -> str:
     """
     Burn subtitles into video frames.
@@ -21,6 +22,7 @@ def burn_subtitles_into_video(
         video_path: Path to source video
         subtitle_path: Path to .srt or .ass subtitle file
         output_path: Path for output video
+        hardware: "cpu" (libx264) or "cuda" (NVDEC/NVENC)
 
     Returns:
         Path to the video with burned-in subtitles
@@ -29,4 +31,5 @@ def burn_subtitles_into_video(
         video_path=video_path,
         subtitle_path=subtitle_path,
         output_path=output_path,
+        hardware=hardware,
     )
@@ -3,7 +3,7 @@ Skill: Subtitle Generation
 Generate SRT/ASS subtitle files with Hebrew RTL styling and word-level timing.
 """
 
-from pathlib import Path
+from functools import lru_cache
 from typing import Optional
 from models import TranscriptSegment
 from utils.hebrew_utils import (
@@ -14,6 +14,19 @@ from utils.hebrew_utils import (
 )
 
 
+@lru_cache(maxsize=4096)
+def _format_segment_text(text: str, max_chars: int) -> str:
+    """
+    Clean, wrap and RTL-mark one segment's text for ASS output.
+
+    Memoized: multi-platform exports render the same segments several
+    times, and the string work (niqqud stripping, word wrapping, RTL
+    markers) is identical every pass.
+    """
+    lines = split_hebrew_lines(clean_transcript_text(text), max_chars)
+    return "\\N".join(wrap_rtl(line) for line in lines)
+
+
 def generate_subtitles(
     segments: list[TranscriptSegment],
     output_path: str,
@@ -43,28 +56,53 @@ def generate_subtitles(
             "max_chars_per_line": 30,
         }
 
-    # ASS header with Hebrew RTL support
-    ass_content = _build_ass_header(style_config)
+    # Stream dialogue events straight into a buffered handle — building
+    # the file with `ass_content +=` copies the whole string on every
+    # iteration (O(N^2) for hundreds of lines).
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        # ASS header with Hebrew RTL support
+        f.write(_build_ass_header(style_config))
+
+        # Add dialogue events
+        for seg in segments:
+            # Adjust timestamps relative to clip start
+            start_time = max(0, seg.start - clip_start)
+            end_time = seg.end - clip_start
+
+            # Clean and wrap Hebrew text (memoized across renders)
+            formatted_text = _format_segment_text(
+                seg.text, style_config.get('max_chars_per_line', 30)
+            )
+
+            f.write(
+                f"Dialogue: 0,{format_timestamp_ass(start_time)},"
+                f"{format_timestamp_ass(end_time)},Hebrew,,0,0,0,,"
+                f"{formatted_text}\n"
+            )
 
-    # Add dialogue events
-    for seg in segments:
-        # Adjust timestamps relative to clip start
-        start_time = max(0, seg.start - clip_start)
-        end_time = seg.end - clip_start
+    return output_path
 
-        # Clean and wrap Hebrew text
-        text = clean_transcript_text(seg.text)
-        lines = split_hebrew_lines(text, style_config.get('max_chars_per_line', 30))
-        formatted_text = "\\N".join(wrap_rtl(line) for line in lines)
 
-        ass_content += (
-            f"Dialogue: 0,{format_timestamp_ass(start_time)},"
-            f"{format_timestamp_ass(end_time)},Hebrew,,0,0,0,,"
-            f"{formatted_text}\n"
-        )
+def _format_timestamps_srt_batch(seconds: list[float]) -> list[str]:
+    """
+    Format many SRT timestamps (HH:MM:SS,mmm) in one vectorized pass.
 
-    Path(output_path).write_text(ass_content, encoding='utf-8')
-    return output_path
+    numpy.divmod computes the hour/minute/second/millisecond columns for
+    the whole clip at once instead of four Python float divisions per
+    boundary, which adds up over hundreds of segments per reel.
+    """
+    import numpy as np
+
+    total_ms = (np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+    hours, rem = np.divmod(total_ms, 3_600_000)
+    minutes, rem = np.divmod(rem, 60_000)
+    secs, millis = np.divmod(rem, 1000)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in zip(
+            hours.tolist(), minutes.tolist(), secs.tolist(), millis.tolist()
+        )
+    ]
 
 
 def generate_srt(
@@ -83,34 +121,27 @@ def generate_srt(
     Returns:
         Path to the generated SRT file
     """
-    from utils.hebrew_utils import format_timestamp_srt
+    # All start and end timestamps for the clip are formatted in two
+    # vectorized batches up front.
+    starts = _format_timestamps_srt_batch(
+        [max(0, seg.start - clip_start) for seg in segments]
+    )
+    ends = _format_timestamps_srt_batch([seg.end - clip_start for seg in segments])
 
-    srt_lines = []
-    for i, seg in enumerate(segments, 1):
-        start_time = max(0, seg.start - clip_start)
-        end_time = seg.end - clip_start
-        text = clean_transcript_text(seg.text)
+    # Streamed buffered write, matching generate_subtitles — no
+    # intermediate list of lines or joined copy of the whole file.
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for i, (seg, ts_start, ts_end) in enumerate(zip(segments, starts, ends), 1):
+            text = clean_transcript_text(seg.text)
 
-        srt_lines.append(str(i))
-        srt_lines.append(
-            f"{format_timestamp_srt(start_time)} --> {format_timestamp_srt(end_time)}"
-        )
-        srt_lines.append(text)
-        srt_lines.append("")
+            f.write(f"{i}\n{ts_start} --> {ts_end}\n{text}\n\n")
 
-    Path(output_path).write_text("\n".join(srt_lines), encoding='utf-8')
     return output_path
 
 
-def _build_ass_header(style_config: dict) -> str:
-    """Build ASS file header with Hebrew-optimized styling."""
-    font = style_config.get('font', 'Arial')
-    size = style_config.get('font_size', 48)
-    primary = style_config.get('primary_color', '&H00FFFFFF')
-    outline = style_config.get('outline_color', '&H00000000')
-    outline_w = style_config.get('outline_width', 3)
-
-    return f"""[Script Info]
+# Header template formatted once per distinct style (see cache below);
+# only the five style-dependent fields are substituted.
+_ASS_HEADER_TMPL = """[Script Info]
 Title: AutoReel Hebrew Subtitles
 ScriptType: v4.00+
 PlayResX: 1080
@@ -124,3 +155,25 @@ Style: Hebrew,{font},{size},{primary},&H000000FF,{outline},&H80000000,-1,0,0,0,1
 [Events]
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
+
+
+@lru_cache(maxsize=16)
+def _render_ass_header(font, size, primary, outline, outline_w) -> str:
+    return _ASS_HEADER_TMPL.format(
+        font=font, size=size, primary=primary, outline=outline, outline_w=outline_w
+    )
+
+
+def _build_ass_header(style_config: dict) -> str:
+    """Build ASS file header with Hebrew-optimized styling."""
+    # Extract the relevant fields into hashable cache-key arguments —
+    # identical style configs across clips share one rendered header.
+    # The font name goes through verbatim: Hebrew family names (e.g.
+    # "דוד") are valid config and fontconfig matches them as-is.
+    return _render_ass_header(
+        style_config.get('font', 'Arial'),
+        style_config.get('font_size', 48),
+        style_config.get('primary_color', '&H00FFFFFF'),
+        style_config.get('outline_color', '&H00000000'),
+        style_config.get('outline_width', 3),
+    )
@@ -4,49 +4,102 @@ Transcribe Hebrew audio using ivrit-ai/whisper-large-v3 fine-tuned Whisper model
 Returns timestamped segments with text and confidence scores.
 """
 
+import asyncio
+import re
+import time
 from typing import Optional
 
+from utils.gemini_utils import configure_gemini, get_model
+
+# Matches '[MM:SS] Speaker Name: Text' transcript lines from Gemini.
+# Compiled once at import; anchored + MULTILINE so one finditer() scan
+# over the whole response replaces a per-line Python loop.
+_GEMINI_LINE_RE = re.compile(r"^\s*\[(\d+):(\d+)\]\s*([^:\n]+):\s*(.*)$", re.MULTILINE)
+
 
 def transcribe_hebrew(
-    audio_path: str,
+    audio_path,
     model_name: str = "ivrit-ai/whisper-large-v3",
     device: str = "cpu",
     language: str = "he",
     method: str = "local",
+    sample_rate: int = 16000,
 ) -> list:
     """
     Transcribe Hebrew audio using either local Whisper or Gemini API.
 
     Args:
-        audio_path: Path to audio file
+        audio_path: Path to audio file, or an in-memory float32 waveform
+            array (local method only — skips the temp-file round-trip)
         model_name: Model identifier
         device: Device for local inference
         language: Language code
         method: "local" (Whisper) or "gemini" (Gemini API)
+        sample_rate: Sample rate of an in-memory waveform input
 
     Returns:
         List of segment dicts
     """
     if method == "gemini":
         return transcribe_with_gemini(audio_path, model_name, language)
-    
+
+    # Prefer the faster-whisper (CTranslate2) backend when installed:
+    # the same weights run 2-4x faster at roughly half the memory
+    # through tuned C++ kernels. Optional dependency — anything missing
+    # drops through to the transformers pipeline below.
+    try:
+        return _transcribe_faster_whisper(
+            audio_path, model_name, device, language, sample_rate
+        )
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"  ⚠️ faster-whisper backend failed ({e}); falling back to transformers")
+
     # Use transformers pipeline for local ivrit-ai model
     from transformers import pipeline
     import torch
 
-    pipe = pipeline(
-        "automatic-speech-recognition",
+    pipe_kwargs = dict(
+        task="automatic-speech-recognition",
         model=model_name,
         torch_dtype=torch.float16 if device == "cuda" else torch.float32,
         device=device,
     )
+    if device == "cuda":
+        # Batched long-form inference: 30s chunks decoded 16 at a time
+        # keeps the GPU saturated instead of one chunk per decoder pass.
+        pipe_kwargs.update(chunk_length_s=30, batch_size=16)
+        try:
+            pipe = pipeline(
+                **pipe_kwargs,
+                model_kwargs={"attn_implementation": "flash_attention_2"},
+            )
+        except (ImportError, ValueError):
+            # flash-attn not installed or GPU too old — fall back to
+            # PyTorch's fused SDPA attention kernels.
+            pipe = pipeline(
+                **pipe_kwargs,
+                model_kwargs={"attn_implementation": "sdpa"},
+            )
+    else:
+        pipe = pipeline(**pipe_kwargs)
+
+    # A raw waveform is passed with its sample rate; a path goes through as-is.
+    if isinstance(audio_path, str):
+        audio_input = audio_path
+    else:
+        audio_input = {"raw": audio_path, "sampling_rate": sample_rate}
 
     result = pipe(
-        audio_path,
+        audio_input,
         return_timestamps=True,
         generate_kwargs={
             "language": language,
             "task": "transcribe",
+            # Greedy decoding — beam search multiplies decoder work for
+            # negligible gain on clean podcast audio.
+            "num_beams": 1,
         },
     )
 
@@ -65,6 +118,99 @@ def transcribe_hebrew(
     return segments
 
 
+def _transcribe_faster_whisper(
+    audio_path,
+    model_name: str,
+    device: str,
+    language: str,
+    sample_rate: int,
+) -> list:
+    """
+    Local transcription via the CTranslate2 faster-whisper backend.
+
+    Looks for a converted model at models/<name>-ct2 (produced once with
+    ct2-transformers-converter) and otherwise passes model_name through
+    for faster-whisper to resolve. float16 on GPU; int8 on CPU, which
+    maps to native int8 dot-product instructions on modern x86.
+    """
+    from pathlib import Path
+
+    from faster_whisper import WhisperModel
+
+    local_ct2 = Path("models") / f"{model_name.split('/')[-1]}-ct2"
+    model = WhisperModel(
+        str(local_ct2) if local_ct2.exists() else model_name,
+        device=device,
+        compute_type="float16" if device == "cuda" else "int8",
+    )
+
+    # A raw waveform goes straight in; faster-whisper accepts both.
+    segments_iter, _info = model.transcribe(
+        audio_path,
+        language=language,
+        vad_filter=True,
+    )
+
+    return [
+        {
+            "start": seg.start,
+            "end": seg.end,
+            "text": seg.text.strip(),
+            "speaker": None,
+            "confidence": None,
+        }
+        for seg in segments_iter
+    ]
+
+
+GEMINI_TRANSCRIBE_PROMPT = """
+    Transcribe the following Hebrew audio.
+    Identify different speakers and label them.
+    Format the output as a simple list with timestamps.
+
+    Format:
+    [00:00] Speaker A: (text)
+    [00:45] Speaker B: (text)
+
+    Important:
+    1. Group the text into logical paragraphs (~30-60 seconds each).
+    2. Ensure the timestamps are accurate.
+    3. Output ONLY the transcription in the format above.
+    """
+
+
+def _configure_gemini():
+    """Configure genai once per process (shared with highlight detection)."""
+    return configure_gemini()
+
+
+def _parse_gemini_transcript(text_output: str) -> list:
+    """Parse '[MM:SS] Speaker: text' lines into segment dicts."""
+    raw = [
+        (float(int(m[1]) * 60 + int(m[2])), m[3].strip(), m[4].strip())
+        for m in _GEMINI_LINE_RE.finditer(text_output)
+    ]
+    if not raw:
+        return []
+
+    # Each segment ends where the next one starts (the last one gets
+    # 30s padding). Pairing with a shifted view builds every dict fully
+    # formed in one pass — no second mutation sweep over the list.
+    next_starts = [start for start, _, _ in raw[1:]]
+    next_starts.append(raw[-1][0] + 30.0)
+
+    return [
+        {
+            "start": start,
+            "end": end,
+            "text": text,
+            "speaker": speaker,
+            "confidence": None,
+        }
+        for (start, speaker, text), end in zip(raw, next_starts)
+    ]
+
+
 def transcribe_with_gemini(
     audio_path: str,
     model_name: str = "gemini-2.0-flash-exp",
@@ -73,25 +219,12 @@ def transcribe_with_gemini(
     """
     Transcribe audio using Google Gemini API with speaker diarization.
     """
-    import google.generativeai as genai
-    import time
-    import os
-    import json
-    from dotenv import load_dotenv
-
-    load_dotenv()
-    
-    # Try both common env names
-    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY not found in environment")
-        
-    genai.configure(api_key=api_key)
+    genai = _configure_gemini()
 
     # 1. Upload the file
     print(f"  ☁️ Uploading audio to Gemini File API...")
     audio_file = genai.upload_file(path=audio_path)
-    
+
     # 2. Wait for processing
     while audio_file.state.name == "PROCESSING":
         time.sleep(2)
@@ -101,57 +234,51 @@ def transcribe_with_gemini(
         raise ValueError(f"Gemini File API processing failed for {audio_path}")
 
     # 3. Request transcription with speaker diarization
-    model = genai.GenerativeModel(model_name)
-    
-    prompt = """
-    Transcribe the following Hebrew audio. 
-    Identify different speakers and label them.
-    Format the output as a simple list with timestamps.
-    
-    Format:
-    [00:00] Speaker A: (text)
-    [00:45] Speaker B: (text)
-    
-    Important: 
-    1. Group the text into logical paragraphs (~30-60 seconds each).
-    2. Ensure the timestamps are accurate.
-    3. Output ONLY the transcription in the format above.
-    """
+    model = get_model(model_name)
 
     print(f"  🧠 Generating transcript with {model_name}...")
-    response = model.generate_content([prompt, audio_file])
+    response = model.generate_content([GEMINI_TRANSCRIBE_PROMPT, audio_file])
 
     # 4. Cleanup
     genai.delete_file(audio_file.name)
 
-    text_output = response.text.strip()
-    segments = []
-    
-    import re
-    # Pattern to match [MM:SS] Speaker Name: Text
-    pattern = re.compile(r"\[(\d+):(\d+)\]\s*([^:]+):\s*(.*)")
-    
-    lines = text_output.splitlines()
-    for i, line in enumerate(lines):
-        match = pattern.match(line.strip())
-        if match:
-            minutes, seconds, speaker, text = match.groups()
-            start_time = int(minutes) * 60 + int(seconds)
-            
-            # Estimate end time based on next segment or duration
-            segments.append({
-                "start": float(start_time),
-                "text": text.strip(),
-                "speaker": speaker.strip(),
-                "confidence": None
-            })
-
-    # Fill in end times
-    for i in range(len(segments) - 1):
-        segments[i]["end"] = segments[i+1]["start"]
-    
-    if segments:
-        # Last segment padding
-        segments[-1]["end"] = segments[-1]["start"] + 30.0 
+    return _parse_gemini_transcript(response.text.strip())
 
-    return segments
+
+async def transcribe_with_gemini_async(
+    audio_path: str,
+    model_name: str = "gemini-2.0-flash-exp",
+    language: str = "he",
+) -> list:
+    """
+    Async variant of transcribe_with_gemini.
+
+    Upload and polling run in worker threads and generation goes through
+    generate_content_async, so an event loop driving several videos keeps
+    the network busy — one file can be uploading while another is being
+    transcribed — instead of serializing on blocking calls.
+    """
+    genai = _configure_gemini()
+
+    # 1. Upload the file (blocking SDK call — run off the event loop)
+    print(f"  ☁️ Uploading audio to Gemini File API...")
+    audio_file = await asyncio.to_thread(genai.upload_file, path=audio_path)
+
+    # 2. Wait for processing
+    while audio_file.state.name == "PROCESSING":
+        await asyncio.sleep(2)
+        audio_file = await asyncio.to_thread(genai.get_file, audio_file.name)
+
+    if audio_file.state.name == "FAILED":
+        raise ValueError(f"Gemini File API processing failed for {audio_path}")
+
+    # 3. Request transcription with speaker diarization
+    model = get_model(model_name)
+
+    print(f"  🧠 Generating transcript with {model_name}...")
+    response = await model.generate_content_async([GEMINI_TRANSCRIBE_PROMPT, audio_file])
+
+    # 4. Cleanup
+    await asyncio.to_thread(genai.delete_file, audio_file.name)
+
+    return _parse_gemini_transcript(response.text.strip())
@@ -56,14 +56,14 @@ def _load_from_path(path: str) -> str:
     return str(file_path.resolve())
 
 
-def _download_from_url(url: str, output_dir: str) -> str:
-    """Download video from URL using yt-dlp."""
+def _build_download_cmd(url: str, output_dir: str) -> list[str]:
+    """Build the yt-dlp argv shared by the sync and async download paths."""
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
     output_template = str(output_path / "%(title)s.%(ext)s")
 
-    cmd = [
+    return [
         "yt-dlp",
         "--format", "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
         "--output", output_template,
@@ -72,7 +72,39 @@ def _download_from_url(url: str, output_dir: str) -> str:
         url,
     ]
 
+
+def _download_from_url(url: str, output_dir: str) -> str:
+    """Download video from URL using yt-dlp."""
+    cmd = _build_download_cmd(url, output_dir)
+
     result = subprocess.run(cmd, check=True, capture_output=True, text=True)
     downloaded_path = result.stdout.strip().split('\n')[-1]
 
     return downloaded_path
+
+
+async def _download_from_url_async(url: str, output_dir: str) -> str:
+    """
+    Async variant of _download_from_url.
+
+    yt-dlp is network-bound, so callers on an event loop can gather
+    several downloads concurrently instead of serializing them —
+    throughput is then limited by bandwidth, not by one subprocess at
+    a time.
+    """
+    import asyncio
+
+    cmd = _build_download_cmd(url, output_dir)
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, output=stdout, stderr=stderr
+        )
+
+    return stdout.decode().strip().split('\n')[-1]
@@ -13,6 +13,7 @@ def resize_to_vertical(
     height: int = 1920,
     crf: int = 23,
     preset: str = "medium",
+    hardware: str = "cpu",
 ) -> str:
     """
     Resize video to vertical 9:16 format for social media.
@@ -27,6 +28,7 @@ def resize_to_vertical(
         height: Target height (default 1920)
         crf: Quality factor (23 default, 28-30 for mobile compression)
         preset: FFmpeg speed preset
+        hardware: "auto", "cpu" (libx264) or "cuda" (NVDEC/NVENC)
 
     Returns:
         Path to the resized video
@@ -38,4 +40,5 @@ def resize_to_vertical(
         height=height,
         crf=crf,
         preset=preset,
+        hardware=hardware,
     )
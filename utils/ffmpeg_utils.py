@@ -5,15 +5,159 @@ Wrapper around FFmpeg for common video/audio operations.
 
 import subprocess
 import os
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union, List
 
+
+@lru_cache(maxsize=1)
+def detect_encoder() -> str:
+    """
+    Best available h264 encoder, probed once per process.
+
+    Asks `ffmpeg -encoders` whether h264_nvenc is compiled in; the NVENC
+    ASIC encodes 1080p several times faster than libx264 on CPU. Falls
+    back to libx264 when ffmpeg lacks the encoder (or is missing).
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            check=True, capture_output=True, text=True,
+        )
+        if "h264_nvenc" in result.stdout:
+            return "h264_nvenc"
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return "libx264"
+
+
+def _resolve_hardware(hardware: str) -> str:
+    """Map 'auto' to 'cuda' when NVENC is available, else 'cpu'."""
+    if hardware == "auto":
+        return "cuda" if detect_encoder() == "h264_nvenc" else "cpu"
+    return hardware
+
+
+def _hwaccel_args(hardware: str, keep_frames_on_gpu: bool = False) -> List[str]:
+    """
+    Input-side decode args: NVDEC when hardware is 'cuda', else none.
+
+    keep_frames_on_gpu adds -hwaccel_output_format cuda so decoded
+    surfaces stay in VRAM and feed NVENC directly, skipping two
+    full-frame PCIe copies per frame. Only valid when the command runs
+    no CPU filters — crop/scale/subtitles operate on system-memory
+    frames — so filterless callers opt in explicitly.
+    """
+    if _resolve_hardware(hardware) != "cuda":
+        return []
+    args = ["-hwaccel", "cuda"]
+    if keep_frames_on_gpu:
+        args.extend(["-hwaccel_output_format", "cuda"])
+    return args
+
+
+# libx264 presets mapped to their closest NVENC p1 (fastest) .. p7 (best).
+_NVENC_PRESETS = {
+    "ultrafast": "p1",
+    "superfast": "p2",
+    "veryfast": "p3",
+    "faster": "p4",
+    "fast": "p4",
+    "medium": "p4",
+    "slow": "p5",
+    "slower": "p6",
+    "veryslow": "p7",
+}
+
+
+def _encoder_args(hardware: str, crf: int, preset: str) -> List[str]:
+    """
+    Video encoder args for the requested hardware.
+
+    On 'cuda' ('auto' resolves to it when NVENC exists), encode with the
+    dedicated NVENC ASIC (quality steered via -cq, roughly comparable to
+    libx264 CRF; preset mapped to the nearest p-level); otherwise libx264
+    on CPU. Frames stay in system memory so CPU-only filters
+    (crop/scale/ass) keep working in either mode.
+    """
+    if _resolve_hardware(hardware) == "cuda":
+        nvenc_preset = _NVENC_PRESETS.get(preset, "p4")
+        return ["-c:v", "h264_nvenc", "-preset", nvenc_preset, "-cq", str(crf)]
+    return ["-c:v", "libx264", "-crf", str(crf), "-preset", preset]
+
+
+def _audio_args(video_path: str, bitrate: Optional[str] = None) -> List[str]:
+    """
+    Audio codec args: stream copy when the source is already AAC.
+
+    Source MP4s almost always carry AAC, so re-encoding is a wasted
+    decode+encode pass; the probe is served from the get_video_info
+    cache. Unprobeable or non-AAC sources re-encode as before.
+    """
+    try:
+        info = get_video_info(str(video_path))
+        audio = next(
+            s for s in info["streams"] if s.get("codec_type") == "audio"
+        )
+        if audio.get("codec_name") == "aac":
+            return ["-c:a", "copy"]
+    except (subprocess.CalledProcessError, StopIteration, KeyError, OSError):
+        pass
+    args = ["-c:a", "aac"]
+    if bitrate:
+        args.extend(["-b:a", bitrate])
+    return args
+
+
+def _thread_args(threads: int = 0) -> List[str]:
+    """
+    ffmpeg threading flags for codec and filter-graph work.
+
+    0 means "auto" (one thread per core). Callers running several ffmpeg
+    processes side by side can pass an explicit count so N processes
+    share the cores instead of each spawning a full set of threads.
+    """
+    return [
+        "-threads", str(threads),
+        "-filter_threads", str(threads),
+        "-filter_complex_threads", str(threads),
+    ]
+
+
+def run_ffmpeg(cmd: List[str]) -> None:
+    """
+    Run an ffmpeg command, keeping only a bounded tail of stderr.
+
+    capture_output=True accumulates every stderr progress line for the
+    whole run — many MB on long encodes, and a potential stall when the
+    pipe buffer fills. Here stdout is discarded and only the last 200
+    stderr lines are retained for error reporting, so memory stays flat
+    regardless of encode length. Raises CalledProcessError (with that
+    tail as .stderr) on failure, like the subprocess.run calls it
+    replaces.
+    """
+    from collections import deque
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    tail = deque(maxlen=200)
+    for line in proc.stderr:
+        tail.append(line)
+    proc.wait()
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, stderr=b"".join(tail)
+        )
+
+
 def extract_audio(
     video_path: str,
     output_path: Optional[str] = None,
     speed_factor: float = 1.0,
     sample_rate: int = 16000,
     channels: int = 1,
+    codec: str = "pcm",
 ) -> str:
     """
     Extract audio from video file, optionally speed it up.
@@ -23,10 +167,13 @@ def extract_audio(
 
     Args:
         video_path: Path to input video file
-        output_path: Path for output audio file (default: same dir as video, .wav)
+        output_path: Path for output audio file (default: same dir as video,
+            .wav for pcm / .ogg for opus)
         speed_factor: Speed multiplier (2.0 = double speed, 1.0 = normal)
         sample_rate: Audio sample rate (16000 optimal for Whisper)
         channels: Number of audio channels (1 = mono)
+        codec: "pcm" (uncompressed .wav) or "opus" (12 kbps .ogg — ~40×
+            smaller, for upload-bound API transcription)
 
     Returns:
         Path to the extracted audio file
@@ -34,7 +181,8 @@ def extract_audio(
     video_path = Path(video_path)
     if output_path is None:
         suffix = f"_x{speed_factor}" if speed_factor != 1.0 else ""
-        output_path = str(video_path.parent / f"{video_path.stem}{suffix}.wav")
+        ext = ".ogg" if codec == "opus" else ".wav"
+        output_path = str(video_path.parent / f"{video_path.stem}{suffix}{ext}")
 
     cmd = [
         "ffmpeg", "-y",
@@ -48,18 +196,67 @@ def extract_audio(
     if speed_factor != 1.0:
         cmd.extend(["-af", f"atempo={speed_factor}"])
 
+    if codec == "opus":
+        # Speech stays fully intelligible at 12 kbps mono, and 16 kHz is
+        # one of libopus's native rates.
+        cmd.extend(["-c:a", "libopus", "-b:a", "12k"])
+
     cmd.append(output_path)
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    run_ffmpeg(cmd)
     return output_path
 
 
+def extract_audio_array(
+    video_path: str,
+    speed_factor: float = 1.0,
+    sample_rate: int = 16000,
+    channels: int = 1,
+):
+    """
+    Decode a video's audio track straight to a float32 waveform in memory.
+
+    Streams raw PCM over a pipe instead of writing a .wav to disk and
+    re-reading it — for a 2-hour podcast at 16 kHz mono that avoids
+    ~220 MB of filesystem traffic.
+
+    Args:
+        video_path: Path to input video file
+        speed_factor: Speed multiplier (2.0 = double speed, 1.0 = normal)
+        sample_rate: Audio sample rate (16000 optimal for Whisper)
+        channels: Number of audio channels (1 = mono)
+
+    Returns:
+        1-D numpy float32 array in [-1, 1], ready for Whisper
+    """
+    import numpy as np
+
+    cmd = [
+        "ffmpeg",
+        "-i", str(video_path),
+        "-vn",
+        "-ac", str(channels),
+        "-ar", str(sample_rate),
+    ]
+
+    if speed_factor != 1.0:
+        cmd.extend(["-af", f"atempo={speed_factor}"])
+
+    cmd.extend(["-f", "s16le", "-"])
+
+    result = subprocess.run(
+        cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
 def cut_clip(
     video_path: str,
     output_path: str,
     start: float,
     end: float,
     reencode: bool = True,
+    hardware: str = "cpu",
 ) -> str:
     """
     Cut a clip from a video at precise timestamps.
@@ -70,6 +267,7 @@ def cut_clip(
         start: Start time in seconds
         end: End time in seconds
         reencode: If True, re-encode for frame-accurate cuts
+        hardware: "auto", "cpu" (libx264) or "cuda" (NVDEC/NVENC)
 
     Returns:
         Path to the extracted clip
@@ -79,14 +277,15 @@ def cut_clip(
     cmd = ["ffmpeg", "-y"]
 
     if reencode:
+        cmd.extend(_thread_args())
+        # No filters in this command, so decoded frames can stay in VRAM.
+        cmd.extend(_hwaccel_args(hardware, keep_frames_on_gpu=True))
         cmd.extend([
             "-ss", str(start),
             "-i", str(video_path),
             "-t", str(duration),
-            "-c:v", "libx264",
-            "-crf", "18",
-            "-preset", "ultrafast",
-            "-c:a", "aac",
+            *_encoder_args(hardware, crf=18, preset="ultrafast"),
+            *_audio_args(video_path),
             output_path,
         ])
     else:
@@ -99,10 +298,311 @@ def cut_clip(
             output_path,
         ])
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    run_ffmpeg(cmd)
+    return output_path
+
+
+def split_into_gop_segments(
+    video_path: str,
+    segments_dir: Optional[str] = None,
+    segment_time: float = 2.0,
+) -> str:
+    """
+    Pre-split a video into short keyframe-aligned segments via stream copy.
+
+    One-time preprocess for segment-based clip extraction: with the source
+    chopped into ~segment_time pieces, any clip window can later be
+    assembled mostly from whole segments with -c copy instead of
+    re-encoding the full clip. A segments.csv index (name, start, end) is
+    written alongside; if it already exists the split is skipped.
+
+    Args:
+        video_path: Path to source video
+        segments_dir: Directory for the segments (default: <stem>_segments
+            next to the source video)
+        segment_time: Target segment length in seconds (actual boundaries
+            land on the next keyframe, since nothing is re-encoded)
+
+    Returns:
+        Path to the segments directory
+    """
+    video_path = Path(video_path)
+    if segments_dir is None:
+        segments_dir = str(video_path.parent / f"{video_path.stem}_segments")
+    segments_dir = Path(segments_dir)
+    index_path = segments_dir / "segments.csv"
+
+    if index_path.exists():
+        return str(segments_dir)
+
+    segments_dir.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", str(video_path),
+        "-c", "copy",
+        "-map", "0",
+        "-f", "segment",
+        "-segment_time", str(segment_time),
+        "-reset_timestamps", "1",
+        "-segment_list", str(index_path),
+        "-segment_list_type", "csv",
+        str(segments_dir / "seg_%05d.mp4"),
+    ]
+    run_ffmpeg(cmd)
+    return str(segments_dir)
+
+
+@lru_cache(maxsize=8)
+def _load_segment_index(segments_dir: str) -> tuple:
+    """Parse segments.csv into a sorted tuple of (path, start, end)."""
+    index_path = Path(segments_dir) / "segments.csv"
+    entries = []
+    with open(index_path) as f:
+        for line in f:
+            name, start, end = line.strip().rsplit(",", 2)
+            entries.append((str(Path(segments_dir) / name), float(start), float(end)))
+    entries.sort(key=lambda e: e[1])
+    return tuple(entries)
+
+
+def cut_clip_segmented(
+    video_path: str,
+    output_path: str,
+    start: float,
+    end: float,
+    segments_dir: str,
+) -> str:
+    """
+    Cut a clip by concatenating pre-split segments instead of re-encoding.
+
+    Segments fully inside [start, end] are stream-copied as-is; only the
+    partial head and tail fragments (at most one segment length each) are
+    re-encoded from the source. For long clips this turns an encode-bound
+    cut into an I/O-bound one. Requires split_into_gop_segments() to have
+    been run; the concat demuxer expects the head/tail encodes to match
+    the source's codec parameters (h264/aac sources — the repo's norm).
+
+    Args:
+        video_path: Path to the original source video (for head/tail cuts)
+        output_path: Path for output clip
+        start: Start time in seconds
+        end: End time in seconds
+        segments_dir: Directory produced by split_into_gop_segments()
+
+    Returns:
+        Path to the extracted clip
+    """
+    index = _load_segment_index(str(segments_dir))
+
+    full = [p for p, s, e in index if s >= start and e <= end]
+    if not full:
+        # Window smaller than a segment — plain re-encoded cut.
+        return cut_clip(video_path, output_path, start, end, reencode=True)
+
+    first_start = min(s for p, s, e in index if s >= start and e <= end)
+    last_end = max(e for p, s, e in index if s >= start and e <= end)
+
+    out = Path(output_path)
+    parts = []
+    tmp = []
+
+    if start < first_start:
+        head = str(out.parent / f"{out.stem}_head.mp4")
+        cut_clip(video_path, head, start, first_start, reencode=True)
+        parts.append(head)
+        tmp.append(head)
+
+    parts.extend(full)
+
+    if end > last_end:
+        tail = str(out.parent / f"{out.stem}_tail.mp4")
+        cut_clip(video_path, tail, last_end, end, reencode=True)
+        parts.append(tail)
+        tmp.append(tail)
+
+    try:
+        concat_videos(parts, output_path)
+    finally:
+        for path in tmp:
+            Path(path).unlink(missing_ok=True)
+
+    return output_path
+
+
+def cut_and_resize_vertical(
+    video_path: str,
+    output_path: str,
+    start: float,
+    end: float,
+    width: int = 1080,
+    height: int = 1920,
+    crf: int = 23,
+    preset: str = "veryfast",
+    hardware: str = "cpu",
+) -> str:
+    """
+    Cut a clip and resize it to vertical 9:16 in a single ffmpeg pass.
+
+    Fusing the cut and the crop/scale avoids writing and re-reading an
+    intermediate clip file — decoded frames flow straight through the
+    filter graph into the encoder.
+
+    Args:
+        video_path: Path to source video
+        output_path: Path for output clip
+        start: Start time in seconds
+        end: End time in seconds
+        width: Target width (default 1080)
+        height: Target height (default 1920)
+        crf: Constant Rate Factor
+        preset: FFmpeg compression preset
+
+    Returns:
+        Path to the extracted vertical clip
+    """
+    duration = end - start
+
+    # Scale to fill, then center-crop (same strategy as resize_vertical)
+    filter_str = (
+        f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+        f"crop={width}:{height}"
+    )
+
+    cmd = ["ffmpeg", "-y"]
+    cmd.extend(_thread_args())
+    cmd.extend(_hwaccel_args(hardware))
+    cmd.extend([
+        "-ss", str(start),
+        "-i", str(video_path),
+        "-t", str(duration),
+        "-vf", filter_str,
+    ])
+    cmd.extend(_encoder_args(hardware, crf, preset))
+    cmd.extend([
+        "-c:a", "aac",
+        "-b:a", "128k",
+        output_path,
+    ])
+
+    run_ffmpeg(cmd)
     return output_path
 
 
+@lru_cache(maxsize=8)
+def get_keyframe_times(video_path: str) -> tuple:
+    """
+    List keyframe timestamps (in seconds) for a video's first video stream.
+
+    Cached per path — ffprobe only demuxes the container once even when
+    several cuts are snapped against the same source.
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "quiet",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-show_entries", "frame=pts_time",
+        "-of", "csv=p=0",
+        str(video_path),
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+    times = []
+    for line in result.stdout.split():
+        value = line.strip().rstrip(",")
+        if value and value != "N/A":
+            times.append(float(value))
+    times.sort()
+    return tuple(times)
+
+
+def snap_to_keyframes(video_path: str, start: float, end: float) -> tuple:
+    """
+    Snap a cut window outward to keyframe boundaries: start backward to the
+    previous keyframe, end forward to the next one. With keyframe-aligned
+    cut points ffmpeg can stream-copy the clip (no decode, no encode).
+    Returns (start, end) unchanged if no keyframes could be probed.
+    """
+    keyframes = get_keyframe_times(video_path)
+    if not keyframes:
+        return start, end
+
+    idx = bisect_right(keyframes, start) - 1
+    snapped_start = keyframes[idx] if idx >= 0 else keyframes[0]
+
+    idx = bisect_left(keyframes, end)
+    snapped_end = keyframes[idx] if idx < len(keyframes) else end
+
+    return snapped_start, snapped_end
+
+
+def cut_clips_batch(
+    video_path: str,
+    jobs: List[tuple],
+    vertical: bool = True,
+    width: int = 1080,
+    height: int = 1920,
+    crf: int = 23,
+    preset: str = "veryfast",
+    hardware: str = "cpu",
+    stream_copy: bool = False,
+) -> List[str]:
+    """
+    Extract several clips from one source video in a single ffmpeg invocation.
+
+    ffmpeg supports N output groups from one input, so the container is
+    opened and demuxed once and each output group only encodes its own
+    time window — instead of re-opening (and re-seeking) the source once
+    per clip.
+
+    Args:
+        video_path: Path to source video
+        jobs: List of (start, end, output_path) tuples
+        vertical: If True, crop/scale each output to vertical 9:16
+        width: Target width for vertical outputs
+        height: Target height for vertical outputs
+        crf: Constant Rate Factor
+        preset: FFmpeg compression preset
+        hardware: "cpu" (libx264) or "cuda" (NVDEC/NVENC)
+        stream_copy: If True, copy streams without re-encoding (requires
+            keyframe-aligned cut points; ignores the vertical filter)
+
+    Returns:
+        List of output paths, in job order
+    """
+    if not jobs:
+        return []
+
+    filter_str = (
+        f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+        f"crop={width}:{height}"
+    )
+
+    cmd = ["ffmpeg", "-y"]
+    cmd.extend(_thread_args())
+    # Non-vertical batches have no filter graph, so decoded frames can
+    # stay in VRAM all the way to the encoder.
+    cmd.extend(_hwaccel_args(hardware, keep_frames_on_gpu=not vertical))
+    cmd.extend(["-i", str(video_path)])
+    for start, end, output_path in jobs:
+        # Output-group options: each clip gets its own window + encoder.
+        cmd.extend(["-ss", str(start), "-to", str(end)])
+        if stream_copy:
+            cmd.extend(["-c", "copy", str(output_path)])
+            continue
+        if vertical:
+            cmd.extend(["-vf", filter_str])
+        cmd.extend(_encoder_args(hardware, crf, preset))
+        cmd.extend([
+            "-c:a", "aac",
+            "-b:a", "128k",
+            str(output_path),
+        ])
+
+    run_ffmpeg(cmd)
+    return [output_path for _, _, output_path in jobs]
+
+
 def resize_vertical(
     video_path: str,
     output_path: str,
@@ -110,6 +610,7 @@ def resize_vertical(
     height: int = 1920,
     crf: int = 23,
     preset: str = "medium",
+    hardware: str = "cpu",
 ) -> str:
     """
     Resize video to vertical 9:16 format with smart center-crop.
@@ -121,10 +622,30 @@ def resize_vertical(
         height: Target height (default 1920)
         crf: Constant Rate Factor (0-51, lower is better quality, 23 is default, 28-30 good for mobile)
         preset: FFmpeg compression preset (speed vs quality: ultrafast, superfast, veryfast, faster, fast, medium, slow, slower, veryslow)
+        hardware: "auto", "cpu" (libx264) or "cuda" (NVDEC/NVENC)
 
     Returns:
         Path to the resized video
     """
+    import shutil
+
+    # Fast path: source already has the target geometry and codec — a
+    # byte copy replaces the whole decode/scale/encode pass.
+    try:
+        info = get_video_info(str(video_path))
+        stream = next(
+            s for s in info["streams"] if s.get("codec_type") == "video"
+        )
+        if (
+            stream.get("width") == width
+            and stream.get("height") == height
+            and stream.get("codec_name") == "h264"
+        ):
+            shutil.copy2(video_path, output_path)
+            return output_path
+    except (subprocess.CalledProcessError, StopIteration, KeyError):
+        pass  # unprobeable input — fall through to the encode path
+
     # Scale to fill, then center-crop
     filter_str = (
         f"scale={width}:{height}:force_original_aspect_ratio=increase,"
@@ -133,24 +654,40 @@ def resize_vertical(
 
     cmd = [
         "ffmpeg", "-y",
+        *_thread_args(),
+        *_hwaccel_args(hardware),
         "-i", str(video_path),
         "-vf", filter_str,
-        "-c:v", "libx264",
-        "-crf", str(crf),
-        "-preset", preset,
-        "-c:a", "aac",
-        "-b:a", "128k",
+        *_encoder_args(hardware, crf, preset),
+        *_audio_args(video_path, bitrate="128k"),
         output_path,
     ]
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    run_ffmpeg(cmd)
     return output_path
 
 
+def _escape_filter_path(path) -> str:
+    """
+    Quote a filesystem path for use as an ffmpeg filter argument.
+
+    The filtergraph parser treats : , ; [ ] as structure, so a bare path
+    containing any of them silently truncates the argument and the burn
+    falls through to its no-subtitle error path. Single-quoting makes
+    every character literal; an embedded quote is emitted as '\\''
+    (close quote, escaped quote, reopen). Backslashes are normalized to
+    forward slashes, which ffmpeg accepts on every platform and which
+    avoids a second level of backslash escaping.
+    """
+    literal = str(path).replace("\\", "/").replace("'", r"'\''")
+    return f"'{literal}'"
+
+
 def burn_subtitles(
     video_path: str,
     subtitle_path: str,
     output_path: str,
+    hardware: str = "cpu",
 ) -> str:
     """
     Burn (hardcode) subtitles into the video frames.
@@ -163,25 +700,35 @@ def burn_subtitles(
     Returns:
         Path to the video with burned-in subtitles
     """
-    # Escape path for FFmpeg filter
-    escaped_sub = str(subtitle_path).replace(":", r"\:").replace("\\", "/")
+    escaped_sub = _escape_filter_path(subtitle_path)
 
     if subtitle_path.endswith(".ass"):
-        filter_str = f"ass={escaped_sub}"
+        filter_str = f"ass=filename={escaped_sub}"
     else:
-        filter_str = f"subtitles={escaped_sub}"
+        # charenc pins the decoder to UTF-8 instead of sniffing, so
+        # Hebrew SRTs render correctly regardless of locale.
+        filter_str = f"subtitles=filename={escaped_sub}:charenc=UTF-8"
 
-    cmd = [
-        "ffmpeg", "-y",
+    cmd = ["ffmpeg", "-y"]
+    cmd.extend(_thread_args())
+    cmd.extend(_hwaccel_args(hardware))
+    cmd.extend([
         "-i", str(video_path),
-        "-vf", filter_str,
-        "-c:v", "libx264",
-        "-c:a", "aac",
+        # filter_complex lets the scheduler run decode/render/encode in
+        # parallel (the -filter_complex_threads flag above); audio is
+        # untouched by the burn, so it's stream-copied, not re-encoded.
+        "-filter_complex", f"[0:v]{filter_str}[v]",
+        "-map", "[v]",
+        "-map", "0:a?",
+    ])
+    cmd.extend(_encoder_args(hardware, crf=23, preset="medium"))
+    cmd.extend([
+        "-c:a", "copy",
         output_path,
-    ]
+    ])
 
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        run_ffmpeg(cmd)
     except subprocess.CalledProcessError as e:
         print(f"⚠️ Warning: Subtitle burning failed: {e.stderr.decode()}")
         print("Falling back to copying video without subtitles...")
@@ -192,27 +739,50 @@ def burn_subtitles(
 
 
 def get_video_duration(video_path: str) -> float:
-    """Get the duration of a video file in seconds."""
+    """
+    Get the duration of a video file in seconds.
+
+    Cached per (resolved path, mtime): several pipeline stages probe the
+    same multi-GB source, and each ffprobe spawn re-opens the container.
+    """
+    real_path = os.path.realpath(str(video_path))
+    return _probe_duration(real_path, os.stat(real_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _probe_duration(video_path: str, mtime_ns: int) -> float:
     cmd = [
         "ffprobe",
         "-v", "quiet",
         "-show_entries", "format=duration",
         "-of", "csv=p=0",
-        str(video_path),
+        video_path,
     ]
     result = subprocess.run(cmd, check=True, capture_output=True, text=True)
     return float(result.stdout.strip())
 
 
 def get_video_info(video_path: str) -> dict:
-    """Get video metadata (resolution, duration, codec, etc.)."""
+    """
+    Get video metadata (resolution, duration, codec, etc.).
+
+    Cached per (resolved path, mtime, size) like get_video_duration —
+    one ffprobe spawn per file instead of one per pipeline stage.
+    """
+    real_path = os.path.realpath(str(video_path))
+    st = os.stat(real_path)
+    return _probe_info(real_path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=256)
+def _probe_info(video_path: str, mtime_ns: int, size: int) -> dict:
     cmd = [
         "ffprobe",
         "-v", "quiet",
         "-print_format", "json",
         "-show_format",
         "-show_streams",
-        str(video_path),
+        video_path,
     ]
     import json
     result = subprocess.run(cmd, check=True, capture_output=True, text=True)
@@ -252,7 +822,7 @@ def concat_videos(
     ]
     
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        run_ffmpeg(cmd)
     except subprocess.CalledProcessError as e:
         print(f"Error during concatenation: {e.stderr.decode()}")
         raise
@@ -263,59 +833,94 @@ def concat_videos(
     return output_path
 
 
+def segment_video_at_times(
+    video_path: str,
+    times: List[float],
+    out_dir: str,
+) -> List[str]:
+    """
+    Split a video into stream-copied parts at the given boundary times.
+
+    One demux pass over the source produces every part — callers that
+    need several different subsets (e.g. one output per speaker) stitch
+    them back with the concat demuxer instead of re-reading and
+    re-encoding the full video per output. Cut points snap to the next
+    keyframe, so actual boundaries can drift up to one GOP.
+
+    Args:
+        video_path: Path to source video
+        times: Sorted interior boundary times in seconds (exclusive of 0)
+        out_dir: Directory for the part files
+
+    Returns:
+        Part paths in timeline order (len(times) + 1 entries when every
+        boundary landed in its own GOP)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", str(video_path),
+        "-c", "copy",
+        "-map", "0",
+        "-f", "segment",
+        "-segment_times", ",".join(f"{t:.6f}" for t in times),
+        "-reset_timestamps", "1",
+        str(out_dir / "part_%05d.mp4"),
+    ]
+    run_ffmpeg(cmd)
+    return sorted(str(p) for p in out_dir.glob("part_*.mp4"))
+
+
 def concat_segments_visual(
     video_path: str,
     segments: List[dict],
     output_path: str,
+    threads: int = 0,
+    hardware: str = "cpu",
 ) -> str:
     """
     Concatenate video segments using a complex filter graph.
     This avoids creating intermediate files but requires re-encoding.
-    
+
+    Segments must be in chronological order (callers pass them sorted).
+
     Args:
         video_path: Source video path
         segments: List of dicts with 'start' and 'end' keys
         output_path: Path for output video
+        threads: ffmpeg thread count (0 = auto; pass an explicit share
+            when running several concats in parallel)
+        hardware: "auto", "cpu" (libx264) or "cuda" (NVDEC/NVENC)
     """
     if not segments:
         return ""
 
-    inputs = []
-    filter_parts = []
-    
-    # We add the same input once because we'll refer to [0:v] and [0:a]
-    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
-    
-    for i, seg in enumerate(segments):
-        start = seg['start']
-        end = seg['end']
-        # Video trim + setpts
-        filter_parts.append(f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]")
-        # Audio trim + asetpts
-        filter_parts.append(f"[0:a]atrim=start={start}:end={end},asetpts=PTS-STARTPTS[a{i}]")
-
-    # The concat part
-    concat_ins = ""
-    for i in range(len(segments)):
-        concat_ins += f"[v{i}][a{i}]"
-    
-    concat_filter = f"{concat_ins}concat=n={len(segments)}:v=1:a=1[outv][outa]"
-    
-    full_filter = ";".join(filter_parts) + ";" + concat_filter
-    
+    cmd = ["ffmpeg", "-y", *_thread_args(threads), "-i", str(video_path)]
+
+    # One decode pass regardless of segment count: N trim branches each
+    # decode the stream from 0 up to their own end point (O(N x duration)
+    # total), while a single select with OR'd between() predicates keeps
+    # every wanted frame in one scan. setpts/asetpts re-time the
+    # surviving frames/samples contiguously.
+    expr = "+".join(f"between(t,{seg['start']},{seg['end']})" for seg in segments)
+    full_filter = (
+        f"[0:v]select='{expr}',setpts=N/FRAME_RATE/TB[outv];"
+        f"[0:a]aselect='{expr}',asetpts=N/SR/TB[outa]"
+    )
+
     cmd.extend([
         "-filter_complex", full_filter,
         "-map", "[outv]",
         "-map", "[outa]",
-        "-c:v", "libx264",
-        "-preset", "superfast",
-        "-crf", "23",
+        *_encoder_args(hardware, crf=23, preset="superfast"),
         "-c:a", "aac",
         str(output_path)
     ])
     
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        run_ffmpeg(cmd)
     except subprocess.CalledProcessError as e:
         print(f"Concatenation failed: {e.stderr.decode()}")
         raise
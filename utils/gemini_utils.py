@@ -0,0 +1,46 @@
+"""
+Gemini Client Utilities
+Shared helpers for the transcription and highlight-detection skills.
+
+configure_gemini() runs load_dotenv + genai.configure exactly once per
+process, and get_model() hands out one GenerativeModel per model name —
+both were previously re-done on every API call.
+"""
+
+import os
+from functools import lru_cache
+
+_configured = False
+
+
+def configure_gemini():
+    """
+    Configure the google.generativeai client once per process.
+
+    Loads .env and calls genai.configure on first use; later calls are
+    a flag check. Returns the genai module for convenience.
+    """
+    global _configured
+    import google.generativeai as genai
+
+    if not _configured:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+        # Try both common env names
+        api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY not found in environment")
+
+        genai.configure(api_key=api_key)
+        _configured = True
+
+    return genai
+
+
+@lru_cache(maxsize=None)
+def get_model(model_name: str):
+    """Return a configured GenerativeModel, one instance per model name."""
+    genai = configure_gemini()
+    return genai.GenerativeModel(model_name)
@@ -6,20 +6,38 @@ Helpers for handling Hebrew / RTL text in subtitles and transcriptions.
 import re
 import unicodedata
 
+# Hebrew niqqud Unicode range: U+0591 to U+05C7. A translate deletion
+# table is a single C loop with a flat lookup \u2014 several times faster
+# than a character-class re.sub for pure deletion.
+_NIQQUD_TABLE = dict.fromkeys(range(0x0591, 0x05C8))
+
+# Compiled once; saves the re-cache dispatch on every clean call.
+_WS_RE = re.compile(r'\s+')
+
+# Hebrew block code points (U+0590-U+05FF) as a frozenset: one hash
+# lookup per character instead of two chained comparisons.
+_HEBREW_CODEPOINTS = frozenset(range(0x0590, 0x0600))
+
 
 def strip_niqqud(text: str) -> str:
     """
     Remove Hebrew niqqud (vowel diacritics) from text.
     Whisper sometimes outputs partial niqqud which can cause display issues.
     """
-    # Hebrew niqqud Unicode range: U+0591 to U+05C7
-    return re.sub(r'[\u0591-\u05C7]', '', text)
+    return text.translate(_NIQQUD_TABLE)
 
 
 def is_hebrew(text: str) -> bool:
     """Check if text is primarily Hebrew."""
-    hebrew_chars = sum(1 for c in text if '\u0590' <= c <= '\u05FF')
-    total_chars = sum(1 for c in text if c.strip())
+    # Both counters in one pass instead of two generator sweeps.
+    hebrew_chars = 0
+    total_chars = 0
+    for c in text:
+        if c.isspace():
+            continue
+        total_chars += 1
+        if ord(c) in _HEBREW_CODEPOINTS:
+            hebrew_chars += 1
     if total_chars == 0:
         return False
     return hebrew_chars / total_chars > 0.3
@@ -46,20 +64,25 @@ def split_hebrew_lines(text: str, max_chars: int = 30) -> list[str]:
     Returns:
         List of text lines
     """
-    words = text.split()
+    # Accumulate words in a list and join per line — growing a string
+    # with f"{line} {word}" recopies it every word, O(N^2) in characters.
     lines = []
-    current_line = ""
-
-    for word in words:
-        if len(current_line) + len(word) + 1 <= max_chars:
-            current_line = f"{current_line} {word}" if current_line else word
+    buf = []
+    length = 0
+
+    for word in text.split():
+        extra = len(word) + 1 if buf else len(word)
+        if length + extra <= max_chars:
+            buf.append(word)
+            length += extra
         else:
-            if current_line:
-                lines.append(current_line.strip())
-            current_line = word
+            if buf:
+                lines.append(" ".join(buf))
+            buf = [word]
+            length = len(word)
 
-    if current_line:
-        lines.append(current_line.strip())
+    if buf:
+        lines.append(" ".join(buf))
 
     return lines
 
@@ -72,7 +95,7 @@ def clean_transcript_text(text: str) -> str:
     - Fix common Whisper artifacts in Hebrew
     """
     text = strip_niqqud(text)
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     text = text.strip()
     return text
 
@@ -26,25 +26,21 @@ def extract_average_colors(video_path: str, fps: float = 1.0) -> List[Dict[str,
     ]
 
     process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-    
-    samples = []
-    timestamp = 0.0
-    
-    while True:
-        # Each frame is 1x1 pixel = 3 bytes
-        data = process.stdout.read(3)
-        if not data or len(data) < 3:
-            break
-            
-        r, g, b = data
-        samples.append({
-            "timestamp": timestamp,
-            "color": [int(r), int(g), int(b)]
-        })
-        timestamp += 1.0 / fps
-        
+
+    # Drain the whole rgb24 stream in one read instead of a 3-byte
+    # read() per frame — thousands of Python calls and tiny syscalls for
+    # a long video collapse into a single buffer + numpy reshape.
+    raw = process.stdout.read()
     process.wait()
-    return samples
+
+    frames = np.frombuffer(raw[: len(raw) - len(raw) % 3], dtype=np.uint8)
+    frames = frames.reshape(-1, 3)
+
+    step = 1.0 / fps
+    return [
+        {"timestamp": i * step, "color": [int(r), int(g), int(b)]}
+        for i, (r, g, b) in enumerate(frames)
+    ]
 
 def cluster_colors(samples: List[Dict[str, Any]], threshold: float = 30.0) -> List[Dict[str, Any]]:
     """
@@ -53,26 +49,30 @@ def cluster_colors(samples: List[Dict[str, Any]], threshold: float = 30.0) -> Li
     """
     if not samples:
         return []
-        
-    clusters = [] # List of average colors for each cluster
-    
+
+    # All cluster centers live in one (K,3) array; the distances from a
+    # sample to every center come out of a single vectorized einsum
+    # instead of a Python loop calling np.linalg.norm per cluster.
+    # Squared distances avoid the per-comparison sqrt.
+    thresh_sq = threshold * threshold
+    centers = np.empty((0, 3), dtype=np.float32)
+
     for sample in samples:
-        color = np.array(sample["color"])
-        
-        assigned = False
-        for i, cluster_avg in enumerate(clusters):
-            dist = np.linalg.norm(color - cluster_avg)
-            if dist < threshold:
-                sample["speaker_id"] = i
-                # Update cluster average (simple moving average or just keep first)
-                clusters[i] = (clusters[i] * 0.9) + (color * 0.1)
-                assigned = True
-                break
-        
-        if not assigned:
-            sample["speaker_id"] = len(clusters)
-            clusters.append(color)
-            
+        color = np.asarray(sample["color"], dtype=np.float32)
+
+        if centers.size:
+            diff = centers - color
+            dist_sq = np.einsum('ij,ij->i', diff, diff)
+            nearest = int(dist_sq.argmin())
+            if dist_sq[nearest] < thresh_sq:
+                sample["speaker_id"] = nearest
+                # Update cluster average (simple moving average)
+                centers[nearest] = centers[nearest] * 0.9 + color * 0.1
+                continue
+
+        sample["speaker_id"] = len(centers)
+        centers = np.vstack([centers, color])
+
     return samples
 
 def get_speaker_segments(video_path: str, fps: float = 1.0, threshold: float = 40.0) -> List[Dict[str, Any]]:
@@ -1,10 +1,12 @@
 import os
+import subprocess
+import tempfile
 import cv2
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 
-def extract_frames(video_path, num_frames=3):
+def extract_frames(video_path, num_frames=3, out_dir="."):
     """Extract frames from start, middle, and end of video."""
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
@@ -12,20 +14,37 @@ def extract_frames(video_path, num_frames=3):
         return []
 
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    indices = [0, total_frames // 2, total_frames - 1]
-    
-    frames = []
-    for idx in indices:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-        ret, frame = cap.read()
-        if ret:
-            # Convert to RGB for Gemini if needed, but we'll save as temp jpg
-            path = f"temp_frame_{idx}.jpg"
-            cv2.imwrite(path, frame)
-            frames.append(path)
-    
     cap.release()
-    return frames
+
+    indices = [0, total_frames // 2, max(total_frames - 1, 0)]
+
+    # One ffmpeg pass with a select filter instead of three cv2 seeks —
+    # each CAP_PROP_POS_FRAMES seek decodes from the previous keyframe,
+    # so the old way could decode seconds of video per frame grabbed.
+    expr = "+".join(f"eq(n,{idx})" for idx in indices)
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-vf", f"select='{expr}'",
+        "-vsync", "vfr",
+        "-frames:v", str(len(indices)),
+        "-q:v", "2",
+        os.path.join(out_dir, "temp_frame_%d.jpg"),
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error: Frame extraction failed: {e.stderr.decode()}")
+        return []
+
+    return [
+        path
+        for path in (
+            os.path.join(out_dir, f"temp_frame_{i}.jpg")
+            for i in range(1, len(indices) + 1)
+        )
+        if os.path.exists(path)
+    ]
 
 def check_privacy(video_path):
     load_dotenv()
@@ -33,14 +52,19 @@ def check_privacy(video_path):
     model = genai.GenerativeModel("gemini-2.5-flash")
 
     print(f"🕵️ Checking privacy for {video_path}...")
-    frames = extract_frames(video_path)
-    if not frames:
-        return "ERROR"
 
-    # Upload frames
-    image_parts = []
-    for f in frames:
-        image_parts.append(genai.upload_file(f))
+    # Inline JPEG parts: a few hundred KB of frames goes straight into
+    # the generate_content request, skipping three File API upload
+    # round-trips. The temp dir cleans the JPEGs up automatically.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        frames = extract_frames(video_path, out_dir=tmp_dir)
+        if not frames:
+            return "ERROR"
+
+        image_parts = []
+        for f in frames:
+            with open(f, "rb") as fh:
+                image_parts.append({"mime_type": "image/jpeg", "data": fh.read()})
 
     prompt = """
     Check these frames from a podcast clip.
@@ -54,13 +78,7 @@ def check_privacy(video_path):
     """
 
     response = model.generate_content([prompt] + image_parts)
-    result = response.text.strip().upper()
-
-    # Cleanup
-    for f in frames:
-        os.remove(f)
-
-    return result
+    return response.text.strip().upper()
 
 if __name__ == "__main__":
     import sys